@@ -1,200 +1,308 @@
 """CLI entry point for cctmux."""
 
+import os
 import sys
+import threading
+from collections.abc import Iterable, Iterator
+from functools import cache
 from pathlib import Path
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
 
 import typer
-from rich.console import Console
 
 from cctmux import __version__
-from cctmux.config import (
-    Config,
-    ConfigPreset,
-    CustomLayout,
-    LayoutType,
-    TeamConfig,
-    display_config_warnings,
-    get_preset_config,
-    load_config,
-    load_team_config,
-    save_config,
-    validate_layout_name,
-)
-from cctmux.git_monitor import run_git_monitor
-from cctmux.session_history import (
-    add_or_update_entry,
-    get_entry_by_name,
-    get_recent_session_names,
-    load_history,
-    save_history,
-)
-from cctmux.session_monitor import (
-    DisplayConfig,
-    run_session_monitor,
-)
-from cctmux.session_monitor import (
-    list_sessions as list_session_files,
-)
-from cctmux.subagent_monitor import (
-    list_subagents,
-    run_subagent_monitor,
-)
-from cctmux.task_monitor import list_sessions, run_monitor
-from cctmux.tmux_manager import (
-    attach_session,
-    create_codex_session,
-    create_gemini_session,
-    create_pi_session,
-    create_session,
-    create_team_session,
-    is_inside_tmux,
-    session_exists,
-)
+from cctmux._cli_enums import ConfigPreset, LayoutType
 from cctmux.utils import get_project_name, is_fzf_available, sanitize_session_name, select_with_fzf
 from cctmux.xdg_paths import ensure_directories, get_config_file_path
 
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from cctmux.config import Config, CustomLayout
+
 app = typer.Typer(
     name="cctmux",
     help="Launch Claude Code inside tmux with session management.",
     no_args_is_help=False,
+    rich_markup_mode=None,
 )
 
-console = Console()
-err_console = Console(stderr=True)
+
+@cache
+def _console() -> "Console":
+    """Return the shared stdout console, importing rich on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
+@cache
+def _err_console() -> "Console":
+    """Return the shared stderr console, importing rich on first use."""
+    from rich.console import Console
+
+    return Console(stderr=True)
+
+
+# Bundled skill sources ship inside the package, so their location is fixed per
+# process. Install destinations stay per-call because they follow $HOME.
+_SKILL_BASE = Path(__file__).parent / "skill"
+_PI_SKILL_BASE = Path(__file__).parent / "skill-pi"
 
 
 def version_callback(value: bool) -> None:
     """Print version and exit."""
     if value:
-        console.print(f"cctmux {__version__}")
+        # Plain write: nothing to style, so skip rich's render pipeline
+        sys.stdout.write(f"cctmux {__version__}\n")
         raise typer.Exit()
 
 
-def _sync_skill() -> None:
-    """Auto-install bundled skills if missing or outdated.
+# Option metadata shared verbatim by several commands. Typer copies the
+# OptionInfo per parameter, so a single instance can be reused safely.
+_VERSION_OPTION = typer.Option("--version", callback=version_callback, is_eager=True, help="Show version.")
+_PRESET_OPTION = typer.Option("--preset", help="Use preset configuration (minimal, verbose, debug).")
+_INTERVAL_OPTION = typer.Option("--interval", "-i", help="Poll interval in seconds.")
+_SESSIONS_PROJECT_OPTION = typer.Option("--project", "-p", help="Project directory to find sessions for.")
+_PROJECT_ROOT_OPTION = typer.Option("--project", "-p", help="Project root directory.")
+_CONFIG_PATH_OPTION = typer.Option("--config", "-C", help="Config file path.")
 
-    Compares the content hash of each bundled file against the installed copy.
-    Runs silently; prints a one-line notice only when an update is applied.
-    Called automatically on every cctmux invocation so 'uv tool upgrade'
-    keeps skills in sync without requiring a manual 'cctmux install-skill'.
-    Handles subdirectories (e.g., references/) recursively.
+
+def _iter_skill_files(root: str, prefix: str = "") -> Iterator[tuple[str, os.DirEntry[str]]]:
+    """Yield every regular file below a bundled skill directory.
+
+    Walks with ``os.scandir`` so the file type (and stat result, once fetched)
+    cached on each ``DirEntry`` is reused instead of re-statting every path.
+
+    Args:
+        root: Directory to walk.
+        prefix: Relative path of ``root`` within the skill, used for recursion.
+
+    Yields:
+        Tuples of (path relative to the skill root, directory entry).
     """
+    with os.scandir(root) as it:
+        for entry in it:
+            rel = os.path.join(prefix, entry.name) if prefix else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_skill_files(entry.path, rel)
+            elif entry.is_file(follow_symlinks=False):
+                yield rel, entry
+
+
+def _skill_file_changed(src_entry: os.DirEntry[str], dest_file: str) -> bool:
+    """Check whether an installed skill file differs from its bundled source.
+
+    Compares size and mtime first; ``_copy_skill_file`` preserves mtime, so an
+    untouched install matches on stat alone. Contents are only hashed when the
+    sizes match but the mtimes differ, and if they turn out identical the
+    installed copy's mtime is realigned so later checks stay stat-only.
+
+    Args:
+        src_entry: Directory entry of the bundled skill file.
+        dest_file: Path of the installed copy.
+
+    Returns:
+        True if the installed copy is missing or its content differs.
+    """
+    try:
+        dest_stat = os.stat(dest_file)
+    except FileNotFoundError:
+        return True
+    src_stat = src_entry.stat()
+    if src_stat.st_size != dest_stat.st_size:
+        return True
+    if src_stat.st_mtime_ns == dest_stat.st_mtime_ns:
+        return False
+
     import hashlib
+
+    with open(src_entry.path, "rb") as src, open(dest_file, "rb") as dest:
+        if hashlib.file_digest(src, "sha256").digest() != hashlib.file_digest(dest, "sha256").digest():
+            return True
+    os.utime(dest_file, ns=(dest_stat.st_atime_ns, src_stat.st_mtime_ns))
+    return False
+
+
+def _copy_skill_file(src_entry: os.DirEntry[str], dest_file: str) -> None:
+    """Atomically copy one bundled skill file into place, preserving its mtime.
+
+    Uses ``shutil.copyfile`` (which takes the kernel fast-copy path) plus an
+    explicit ``os.chmod`` and ``os.utime`` instead of ``shutil.copy2``, so the
+    installed copy keeps the source's permission bits and mtime (the latter is
+    what the stat-based change check relies on); only xattrs are not copied.
+    The copy is written to a temp file next to the target and renamed over
+    it, so an interrupted sync never leaves a partially written file.
+
+    Args:
+        src_entry: Directory entry of the bundled skill file.
+        dest_file: Path of the installed copy.
+    """
     import shutil
+    import stat
+    import tempfile
 
-    skill_base = Path(__file__).parent / "skill"
-    dest_base = Path.home() / ".claude" / "skills"
+    dest_dir = os.path.dirname(dest_file)
+    os.makedirs(dest_dir, exist_ok=True)
+    tmp_fd, tmp_path = tempfile.mkstemp(dir=dest_dir, suffix=".tmp")
+    os.close(tmp_fd)
+    try:
+        shutil.copyfile(src_entry.path, tmp_path)
+        src_stat = src_entry.stat()
+        # mkstemp creates the file owner-only; give it the bundled file's mode
+        os.chmod(tmp_path, stat.S_IMODE(src_stat.st_mode))
+        os.utime(tmp_path, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+        os.replace(tmp_path, dest_file)
+    except OSError:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
 
+
+def _sync_skill_tree(skill_base: Path, dest_base: Path) -> list[str]:
+    """Copy outdated files of each bundled skill under ``skill_base`` into ``dest_base``.
+
+    Only files that are missing or changed in the destination (see
+    ``_skill_file_changed``) are copied, so an up-to-date install does no
+    writes at all. Subdirectories such as ``references/`` are handled
+    recursively. Nothing is printed, so this is safe to run off the main thread.
+
+    Args:
+        skill_base: Directory containing one subdirectory per bundled skill.
+        dest_base: Directory the skills are installed into.
+
+    Returns:
+        A one-line notice (Rich markup) for each skill that was updated.
+    """
+    notices: list[str] = []
     if not skill_base.exists():
-        return
+        return notices
 
-    def _md5(path: Path) -> str:
-        return hashlib.md5(path.read_bytes()).hexdigest()  # noqa: S324
+    with os.scandir(skill_base) as it:
+        skill_dirs = [entry for entry in it if entry.is_dir()]
 
-    for skill_src in skill_base.iterdir():
-        if not skill_src.is_dir():
-            continue
-        skill_dest = dest_base / skill_src.name
-
-        needs_update = False
-        for src_file in skill_src.rglob("*"):
-            if not src_file.is_file():
-                continue
-            rel = src_file.relative_to(skill_src)
-            dest_file = skill_dest / rel
-            if not dest_file.exists() or _md5(src_file) != _md5(dest_file):
-                needs_update = True
-                break
-
-        if needs_update:
-            skill_dest.mkdir(parents=True, exist_ok=True)
-            for src_file in skill_src.rglob("*"):
-                if src_file.is_file():
-                    rel = src_file.relative_to(skill_src)
-                    dest_file = skill_dest / rel
-                    dest_file.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(src_file, dest_file)
-            console.print(f"[dim]✓ {skill_src.name} skill updated ({skill_dest})[/]")
+    for skill_src in skill_dirs:
+        skill_dest = os.path.join(dest_base, skill_src.name)
+
+        changed_files = [
+            (entry, dest_file)
+            for rel, entry in _iter_skill_files(skill_src.path)
+            if _skill_file_changed(entry, dest_file := os.path.join(skill_dest, rel))
+        ]
+
+        if changed_files:
+            for entry, dest_file in changed_files:
+                _copy_skill_file(entry, dest_file)
+            notices.append(f"[dim]✓ {skill_src.name} skill updated ({skill_dest})[/]")
+
+    return notices
+
+
+def _sync_skill() -> list[str]:
+    """Auto-install bundled skills if missing or outdated.
+
+    Compares the size and mtime of each bundled file against the installed copy,
+    falling back to a content hash only when those disagree on an equal size.
+    Called automatically on every cctmux invocation (on a background thread) so
+    'uv tool upgrade' keeps skills in sync without requiring a manual
+    'cctmux install-skill'. Handles subdirectories (e.g., references/) recursively.
+
+    Returns:
+        A one-line notice per updated skill, for the caller to print.
+    """
+    return _sync_skill_tree(_SKILL_BASE, Path.home() / ".claude" / "skills")
 
 
 def _sync_pi_skill() -> None:
     """Auto-install bundled pi skills to ~/.pi/agent/skills/ if missing or outdated.
 
-    Compares the content hash of each bundled file against the installed copy.
+    Uses the same stat-first comparison as ``_sync_skill``.
     Creates the destination tree (~/.pi/agent/skills/) if it does not exist.
     Runs silently; prints a one-line notice only when an update is applied.
     Called automatically on every pitmux invocation.
     """
-    import hashlib
-    import shutil
-
-    skill_base = Path(__file__).parent / "skill-pi"
-    dest_base = Path.home() / ".pi" / "agent" / "skills"
-
-    if not skill_base.exists():
-        return
-
-    def _md5(path: Path) -> str:
-        return hashlib.md5(path.read_bytes()).hexdigest()  # noqa: S324
-
-    for skill_src in skill_base.iterdir():
-        if not skill_src.is_dir():
-            continue
-        skill_dest = dest_base / skill_src.name
-
-        needs_update = False
-        for src_file in skill_src.rglob("*"):
-            if not src_file.is_file():
-                continue
-            rel = src_file.relative_to(skill_src)
-            dest_file = skill_dest / rel
-            if not dest_file.exists() or _md5(src_file) != _md5(dest_file):
-                needs_update = True
-                break
-
-        if needs_update:
-            skill_dest.mkdir(parents=True, exist_ok=True)
-            for src_file in skill_src.rglob("*"):
-                if src_file.is_file():
-                    rel = src_file.relative_to(skill_src)
-                    dest_file = skill_dest / rel
-                    dest_file.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(src_file, dest_file)
-            console.print(f"[dim]✓ {skill_src.name} skill updated ({skill_dest})[/]")
+    for notice in _sync_skill_tree(_PI_SKILL_BASE, Path.home() / ".pi" / "agent" / "skills"):
+        _console().print(notice)
 
 
 @app.command()
 def install_skill() -> None:
     """Install all bundled skills to ~/.claude/skills/."""
-    import shutil
-
-    skill_base = Path(__file__).parent / "skill"
     dest_base = Path.home() / ".claude" / "skills"
 
-    if not skill_base.exists():
-        err_console.print("[red]Error:[/] Skill source not found.")
+    if not _SKILL_BASE.exists():
+        _err_console().print("[red]Error:[/] Skill source not found.")
         raise typer.Exit(1)
 
+    with os.scandir(_SKILL_BASE) as it:
+        skill_dirs = [entry for entry in it if entry.is_dir()]
+
     installed = 0
-    for skill_src in skill_base.iterdir():
-        if not skill_src.is_dir():
-            continue
-        skill_dest = dest_base / skill_src.name
-        skill_dest.mkdir(parents=True, exist_ok=True)
+    for skill_src in skill_dirs:
+        skill_dest = os.path.join(dest_base, skill_src.name)
+        os.makedirs(skill_dest, exist_ok=True)
 
-        for item in skill_src.rglob("*"):
-            if item.is_file():
-                rel = item.relative_to(skill_src)
-                dest_file = skill_dest / rel
-                dest_file.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(item, dest_file)
+        for rel, entry in _iter_skill_files(skill_src.path):
+            _copy_skill_file(entry, os.path.join(skill_dest, rel))
 
-        console.print(f"[green]✓[/] {skill_src.name} installed to {skill_dest}")
+        _console().print(f"[green]✓[/] {skill_src.name} installed to {skill_dest}")
         installed += 1
 
     if installed == 0:
-        err_console.print("[yellow]No skills found to install.[/]")
+        _err_console().print("[yellow]No skills found to install.[/]")
+
+
+def _resolve_project(project: Path | None) -> Path:
+    """Resolve a ``--project`` option, defaulting to the current directory.
+
+    Args:
+        project: The directory passed on the command line, if any.
+
+    Returns:
+        The absolute, symlink-resolved project directory.
+    """
+    return (project if project is not None else Path.cwd()).resolve()
+
+
+def _given_on_cli(ctx: typer.Context, name: str) -> bool:
+    """Check whether an option was passed explicitly on the command line.
+
+    Lets presets be overridden by any explicit value, including one equal to
+    the option's default (e.g. ``-m 10``).
+
+    Args:
+        ctx: The Typer context of the running command.
+        name: The parameter name as declared in the callback signature.
+
+    Returns:
+        True if the value came from the command line rather than a default.
+    """
+    source = ctx.get_parameter_source(name)
+    return source is not None and source.name == "COMMANDLINE"
+
+
+def _append_cli_flags(args: str | None, flags: Iterable[tuple[bool, str]]) -> str | None:
+    """Append the enabled flags to a CLI argument string unless already given.
+
+    Presence is checked per whitespace token (``--opt=value`` counts as
+    ``--opt``), so ``--resume`` is not mistaken for ``--resume-foo``. A flag
+    carrying its own value, such as ``"--resume latest"``, is matched on its
+    first token. The original args are kept verbatim so quoted values survive.
+
+    Args:
+        args: The user or config supplied argument string.
+        flags: Pairs of (enabled, flag) in the order they should be appended.
+
+    Returns:
+        The combined argument string, or None if it is empty.
+    """
+    parts = [args] if args else []
+    existing = {token.split("=", 1)[0] for token in args.split()} if args else set[str]()
+    for enabled, flag in flags:
+        name = flag.split(maxsplit=1)[0]
+        if enabled and name not in existing:
+            parts.append(flag)
+            existing.add(name)
+    return " ".join(parts) or None
 
 
 def _prompt_cross_tool_resume(
@@ -214,6 +322,8 @@ def _prompt_cross_tool_resume(
         The session name to use — either target_name or the first candidate
         the user accepted.
     """
+    from cctmux.tmux_manager import session_exists
+
     if dry_run or session_exists(target_name) or not sys.stdin.isatty():
         return target_name
     for label, name in candidates:
@@ -260,7 +370,7 @@ def main(
     ] = False,
     config_path: Annotated[
         Path | None,
-        typer.Option("--config", "-C", help="Config file path."),
+        _CONFIG_PATH_OPTION,
     ] = None,
     continue_session: Annotated[
         bool,
@@ -296,36 +406,54 @@ def main(
     ] = False,
     version: Annotated[
         bool | None,
-        typer.Option("--version", callback=version_callback, is_eager=True, help="Show version."),
+        _VERSION_OPTION,
     ] = None,
 ) -> None:
     """Launch Claude Code in a tmux session for the current directory."""
-    # Auto-sync the bundled skill on every invocation (no-op if already current)
-    _sync_skill()
-
     # If a subcommand was invoked, don't run main logic
     if ctx.invoked_subcommand is not None:
         return
 
+    from cctmux.config import BUILTIN_LAYOUT_NAMES, display_config_warnings, dump_config_yaml, load_config
+    from cctmux.session_history import (
+        add_or_update_entry,
+        get_entry_by_name,
+        get_recent_session_names,
+        load_history,
+        save_history,
+    )
+    from cctmux.tmux_manager import attach_session, create_session, is_inside_tmux, session_exists
+
+    # Auto-sync the bundled skill before launching Claude (no-op if already current).
+    # Runs in the background so the stat/copy I/O overlaps config loading. The
+    # thread never prints; it is joined before our first output and its notices
+    # are printed here. Copies are atomic, so a daemon thread is safe.
+    skill_notices: list[str] = []
+    skill_sync = threading.Thread(
+        target=lambda: skill_notices.extend(_sync_skill()), name="cctmux-skill-sync", daemon=True
+    )
+    skill_sync.start()
+
     # Ensure directories exist
     ensure_directories()
 
     # Load configuration (use cwd for project-level config discovery)
-    config, config_warnings = load_config(config_path, project_dir=Path.cwd(), strict=strict)
+    cwd = Path.cwd()
+    config, config_warnings = load_config(config_path, project_dir=cwd, strict=strict)
+
+    skill_sync.join()
+    for notice in skill_notices:
+        _console().print(notice)
 
     # Handle config warnings
     if config_warnings:
-        display_config_warnings(config_warnings, err_console)
+        display_config_warnings(config_warnings, _err_console())
         if strict:
             raise typer.Exit(1)
 
     # Handle dump-config
     if dump_config:
-        import yaml
-
-        data = config.model_dump()
-        data["default_layout"] = config.default_layout.value
-        console.print(yaml.dump(data, default_flow_style=False))
+        dump_config_yaml(config, _console().file)
         raise typer.Exit()
 
     # Merge CLI args with config (CLI takes precedence)
@@ -335,43 +463,29 @@ def main(
     else:
         effective_layout = config.default_layout
     effective_status_bar = status_bar or config.status_bar_enabled
-    effective_claude_args = claude_args if claude_args else config.default_claude_args
-    if yolo:
-        skip_flag = "--dangerously-skip-permissions"
-        if effective_claude_args:
-            if skip_flag not in effective_claude_args:
-                effective_claude_args = f"{effective_claude_args} {skip_flag}"
-        else:
-            effective_claude_args = skip_flag
-    if resume:
-        resume_flag = "--resume"
-        if effective_claude_args:
-            if resume_flag not in effective_claude_args:
-                effective_claude_args = f"{effective_claude_args} {resume_flag}"
-        else:
-            effective_claude_args = resume_flag
-    if continue_session:
-        continue_flag = "--continue"
-        if effective_claude_args:
-            if continue_flag not in effective_claude_args:
-                effective_claude_args = f"{effective_claude_args} {continue_flag}"
-        else:
-            effective_claude_args = continue_flag
+    effective_claude_args = _append_cli_flags(
+        claude_args if claude_args else config.default_claude_args,
+        (
+            (yolo, "--dangerously-skip-permissions"),
+            (resume, "--resume"),
+            (continue_session, "--continue"),
+        ),
+    )
     effective_task_list_id = task_list_id or config.task_list_id
     effective_agent_teams = agent_teams or config.agent_teams
 
     if debug or verbose > 1:
-        console.print(f"[dim]Config file: {get_config_file_path()}[/]")
+        _console().print(f"[dim]Config file: {get_config_file_path()}[/]")
         layout_display = effective_layout.value if isinstance(effective_layout, LayoutType) else effective_layout
-        console.print(f"[dim]Layout: {layout_display}[/]")
-        console.print(f"[dim]Status bar: {effective_status_bar}[/]")
+        _console().print(f"[dim]Layout: {layout_display}[/]")
+        _console().print(f"[dim]Status bar: {effective_status_bar}[/]")
         if effective_claude_args:
-            console.print(f"[dim]Claude args: {effective_claude_args}[/]")
+            _console().print(f"[dim]Claude args: {effective_claude_args}[/]")
 
     # Check if running inside tmux
     if is_inside_tmux():
-        err_console.print("[red]Error:[/] Already inside a tmux session.")
-        err_console.print("[dim]Use standard tmux commands to manage panes.[/]")
+        _err_console().print("[red]Error:[/] Already inside a tmux session.")
+        _err_console().print("[dim]Use standard tmux commands to manage panes.[/]")
         raise typer.Exit(1)
 
     # Load history
@@ -384,12 +498,12 @@ def main(
     if recent:
         # Use fzf to select from recent sessions
         if not is_fzf_available():
-            err_console.print("[red]Error:[/] fzf is required for --recent but not installed.")
+            _err_console().print("[red]Error:[/] fzf is required for --recent but not installed.")
             raise typer.Exit(1)
 
         recent_names = get_recent_session_names(history)
         if not recent_names:
-            err_console.print("[yellow]No recent sessions found.[/]")
+            _err_console().print("[yellow]No recent sessions found.[/]")
             raise typer.Exit(1)
 
         selected = select_with_fzf(recent_names, prompt="Session: ")
@@ -401,14 +515,14 @@ def main(
         if entry:
             project_dir = Path(entry.project_dir)
             if not project_dir.exists():
-                err_console.print(f"[yellow]Warning:[/] Project directory no longer exists: {entry.project_dir}")
-                err_console.print("[dim]Falling back to current directory.[/]")
-                project_dir = Path.cwd()
+                _err_console().print(f"[yellow]Warning:[/] Project directory no longer exists: {entry.project_dir}")
+                _err_console().print("[dim]Falling back to current directory.[/]")
+                project_dir = cwd
         else:
-            project_dir = Path.cwd()
+            project_dir = cwd
     else:
         # Use current directory
-        project_dir = Path.cwd()
+        project_dir = cwd
         session_name = sanitize_session_name(get_project_name(project_dir))
 
         # If no cctmux session exists, offer to resume a sibling pitmux/cdxtmux/gemtmux session
@@ -422,34 +536,29 @@ def main(
         )
 
     if debug or verbose > 0:
-        console.print(f"[dim]Session: {session_name}[/]")
-        console.print(f"[dim]Project: {project_dir}[/]")
+        _console().print(f"[dim]Session: {session_name}[/]")
+        _console().print(f"[dim]Project: {project_dir}[/]")
 
     # Create or attach to session
     if session_exists(session_name):
         if verbose > 0 or dry_run:
-            console.print(f"[blue]Attaching to existing session:[/] {session_name}")
+            _console().print(f"[blue]Attaching to existing session:[/] {session_name}")
 
         commands = attach_session(session_name, dry_run=dry_run)
 
         if dry_run:
-            console.print("[yellow]Commands that would be executed:[/]")
+            _console().print("[yellow]Commands that would be executed:[/]")
             for cmd in commands:
-                console.print(f"  {cmd}")
+                _console().print(f"  {cmd}")
     else:
         if verbose > 0 or dry_run:
-            console.print(f"[green]Creating new session:[/] {session_name}")
+            _console().print(f"[green]Creating new session:[/] {session_name}")
 
         # Validate layout name against built-in and custom layouts
-        try:
-            LayoutType(effective_layout)
-        except ValueError:
-            # Not a built-in layout — check custom layouts
-            custom_match = [cl for cl in config.custom_layouts if cl.name == effective_layout]
-            if not custom_match:
-                err_console.print(f"[red]Error:[/] Unknown layout: {effective_layout}")
-                err_console.print("[dim]Use 'cctmux layout list' to see available layouts.[/]")
-                raise typer.Exit(1) from None
+        if effective_layout not in BUILTIN_LAYOUT_NAMES and effective_layout not in config.custom_layouts_by_name:
+            _err_console().print(f"[red]Error:[/] Unknown layout: {effective_layout}")
+            _err_console().print("[dim]Use 'cctmux layout list' to see available layouts.[/]")
+            raise typer.Exit(1)
 
         commands = create_session(
             session_name=session_name,
@@ -464,10 +573,10 @@ def main(
         )
 
         if dry_run:
-            console.print("[yellow]Commands that would be executed:[/]")
+            _console().print("[yellow]Commands that would be executed:[/]")
             for cmd in commands:
-                console.print(f"  {cmd}")
-            console.print("[dim]Note: Actual execution uses pane IDs (%%N) for reliable targeting.[/]")
+                _console().print(f"  {cmd}")
+            _console().print("[dim]Note: Actual execution uses pane IDs (%%N) for reliable targeting.[/]")
 
     # Update history (unless dry run)
     if not dry_run:
@@ -483,22 +592,25 @@ def main(
 @app.command()
 def init_config() -> None:
     """Create default configuration file."""
+    from cctmux.config import Config, save_config
+
     ensure_directories()
     config_file = get_config_file_path()
 
     if config_file.exists():
-        err_console.print(f"[yellow]Config file already exists:[/] {config_file}")
+        _err_console().print(f"[yellow]Config file already exists:[/] {config_file}")
         raise typer.Exit(1)
 
     config = Config()
     save_config(config)
-    console.print(f"[green]✓[/] Created config file: {config_file}")
+    _console().print(f"[green]✓[/] Created config file: {config_file}")
 
 
 tasks_app = typer.Typer(
     name="cctmux-tasks",
     help="Monitor Claude Code tasks in real-time.",
     no_args_is_help=False,
+    rich_markup_mode=None,
 )
 
 
@@ -511,11 +623,11 @@ def tasks_main(
     ] = None,
     project: Annotated[
         Path | None,
-        typer.Option("--project", "-p", help="Project directory to find sessions for."),
+        _SESSIONS_PROJECT_OPTION,
     ] = None,
     interval: Annotated[
         float,
-        typer.Option("--interval", "-i", help="Poll interval in seconds."),
+        _INTERVAL_OPTION,
     ] = 1.0,
     max_tasks: Annotated[
         int | None,
@@ -555,7 +667,7 @@ def tasks_main(
     ] = False,
     preset: Annotated[
         ConfigPreset | None,
-        typer.Option("--preset", help="Use preset configuration (minimal, verbose, debug)."),
+        _PRESET_OPTION,
     ] = None,
     do_list_sessions: Annotated[
         bool,
@@ -563,7 +675,7 @@ def tasks_main(
     ] = False,
     version: Annotated[
         bool | None,
-        typer.Option("--version", callback=version_callback, is_eager=True, help="Show version."),
+        _VERSION_OPTION,
     ] = None,
 ) -> None:
     """Monitor Claude Code tasks with live ASCII dependency visualization.
@@ -586,6 +698,9 @@ def tasks_main(
     if ctx.invoked_subcommand is not None:
         return
 
+    from cctmux.config import get_preset_config
+    from cctmux.task_monitor import list_sessions, run_monitor
+
     if do_list_sessions:
         list_sessions(project_path=project)
         raise typer.Exit(0)
@@ -640,6 +755,7 @@ session_app = typer.Typer(
     name="cctmux-session",
     help="Monitor Claude Code session stream in real-time.",
     no_args_is_help=False,
+    rich_markup_mode=None,
 )
 
 
@@ -652,11 +768,11 @@ def session_main(
     ] = None,
     project: Annotated[
         Path | None,
-        typer.Option("--project", "-p", help="Project directory to find sessions for."),
+        _SESSIONS_PROJECT_OPTION,
     ] = None,
     interval: Annotated[
         float,
-        typer.Option("--interval", "-i", help="Poll interval in seconds."),
+        _INTERVAL_OPTION,
     ] = 0.5,
     max_events: Annotated[
         int | None,
@@ -712,7 +828,7 @@ def session_main(
     ] = False,
     preset: Annotated[
         ConfigPreset | None,
-        typer.Option("--preset", help="Use preset configuration (minimal, verbose, debug)."),
+        _PRESET_OPTION,
     ] = None,
     do_list_sessions: Annotated[
         bool,
@@ -720,7 +836,7 @@ def session_main(
     ] = False,
     version: Annotated[
         bool | None,
-        typer.Option("--version", callback=version_callback, is_eager=True, help="Show version."),
+        _VERSION_OPTION,
     ] = None,
 ) -> None:
     """Monitor Claude Code session stream with live statistics.
@@ -741,6 +857,10 @@ def session_main(
     if ctx.invoked_subcommand is not None:
         return
 
+    from cctmux.config import get_preset_config
+    from cctmux.session_monitor import DisplayConfig, run_session_monitor
+    from cctmux.session_monitor import list_sessions as list_session_files
+
     if do_list_sessions:
         list_session_files(project_path=project)
         raise typer.Exit(0)
@@ -797,6 +917,7 @@ agents_app = typer.Typer(
     name="cctmux-agents",
     help="Monitor Claude Code subagent activity in real-time.",
     no_args_is_help=False,
+    rich_markup_mode=None,
 )
 
 
@@ -809,11 +930,11 @@ def agents_main(
     ] = None,
     project: Annotated[
         Path | None,
-        typer.Option("--project", "-p", help="Project directory to find sessions for."),
+        _SESSIONS_PROJECT_OPTION,
     ] = None,
     interval: Annotated[
         float,
-        typer.Option("--interval", "-i", help="Poll interval in seconds."),
+        _INTERVAL_OPTION,
     ] = 1.0,
     inactive_timeout: Annotated[
         float | None,
@@ -845,7 +966,7 @@ def agents_main(
     ] = False,
     version: Annotated[
         bool | None,
-        typer.Option("--version", callback=version_callback, is_eager=True, help="Show version."),
+        _VERSION_OPTION,
     ] = None,
 ) -> None:
     """Monitor Claude Code subagent activity with live updates.
@@ -869,8 +990,11 @@ def agents_main(
     if ctx.invoked_subcommand is not None:
         return
 
+    from cctmux.config import load_config
+    from cctmux.subagent_monitor import list_subagents, run_subagent_monitor
+
     # Resolve inactive timeout: CLI flag > config > default (300s)
-    config, _agent_warnings = load_config(project_dir=project or Path.cwd())
+    config, _agent_warnings = load_config(project_dir=_resolve_project(project))
     effective_timeout = inactive_timeout if inactive_timeout is not None else config.agent_monitor.inactive_timeout
 
     if do_list:
@@ -892,6 +1016,7 @@ activity_app = typer.Typer(
     name="cctmux-activity",
     help="Display Claude Code usage activity dashboard.",
     no_args_is_help=False,
+    rich_markup_mode=None,
 )
 
 
@@ -920,11 +1045,11 @@ def activity_main(
     ] = False,
     preset: Annotated[
         ConfigPreset | None,
-        typer.Option("--preset", help="Use preset configuration (minimal, verbose, debug)."),
+        _PRESET_OPTION,
     ] = None,
     version: Annotated[
         bool | None,
-        typer.Option("--version", callback=version_callback, is_eager=True, help="Show version."),
+        _VERSION_OPTION,
     ] = None,
 ) -> None:
     """Display Claude Code activity dashboard with usage statistics.
@@ -943,6 +1068,7 @@ def activity_main(
         return
 
     from cctmux.activity_monitor import run_activity_monitor
+    from cctmux.config import get_preset_config
 
     # Load preset configuration if specified
     if preset:
@@ -959,7 +1085,7 @@ def activity_main(
         effective_show_model_usage = not no_model_usage
 
     # CLI overrides preset
-    if days != 14:
+    if _given_on_cli(ctx, "days"):
         effective_days = days
 
     run_activity_monitor(
@@ -975,6 +1101,7 @@ git_app = typer.Typer(
     name="cctmux-git",
     help="Monitor git repository status in real-time.",
     no_args_is_help=False,
+    rich_markup_mode=None,
 )
 
 
@@ -987,7 +1114,7 @@ def git_main(
     ] = None,
     interval: Annotated[
         float,
-        typer.Option("--interval", "-i", help="Poll interval in seconds."),
+        _INTERVAL_OPTION,
     ] = 2.0,
     max_commits: Annotated[
         int,
@@ -1023,11 +1150,11 @@ def git_main(
     ] = None,
     preset: Annotated[
         ConfigPreset | None,
-        typer.Option("--preset", help="Use preset configuration (minimal, verbose, debug)."),
+        _PRESET_OPTION,
     ] = None,
     version: Annotated[
         bool | None,
-        typer.Option("--version", callback=version_callback, is_eager=True, help="Show version."),
+        _VERSION_OPTION,
     ] = None,
 ) -> None:
     """Monitor git repository status with live updates.
@@ -1049,6 +1176,9 @@ def git_main(
     if ctx.invoked_subcommand is not None:
         return
 
+    from cctmux.config import get_preset_config, load_config
+    from cctmux.git_monitor import run_git_monitor
+
     # Load preset configuration if specified
     if preset:
         preset_config = get_preset_config(preset)
@@ -1068,17 +1198,22 @@ def git_main(
         effective_max_commits = max_commits
         effective_max_files = max_files
         effective_interval = interval
-        # Use config defaults when no preset
-        config, _git_warnings = load_config(project_dir=project or Path.cwd())
-        effective_fetch_enabled = config.git_monitor.fetch_enabled
-        effective_fetch_interval = config.git_monitor.fetch_interval
+        if (fetch or no_fetch) and fetch_interval is not None:
+            # Config only supplies the fetch settings, and the CLI overrides both below
+            effective_fetch_enabled = fetch
+            effective_fetch_interval = fetch_interval
+        else:
+            # Use config defaults when no preset
+            config, _git_warnings = load_config(project_dir=_resolve_project(project))
+            effective_fetch_enabled = config.git_monitor.fetch_enabled
+            effective_fetch_interval = config.git_monitor.fetch_interval
 
     # CLI overrides preset
-    if max_commits != 10:
+    if _given_on_cli(ctx, "max_commits"):
         effective_max_commits = max_commits
-    if max_files != 20:
+    if _given_on_cli(ctx, "max_files"):
         effective_max_files = max_files
-    if interval != 2.0:
+    if _given_on_cli(ctx, "interval"):
         effective_interval = interval
 
     # --fetch / --no-fetch CLI flags override preset/config
@@ -1106,6 +1241,7 @@ ralph_app = typer.Typer(
     name="cctmux-ralph",
     help="Ralph Loop: automated iterative Claude Code execution.",
     no_args_is_help=False,
+    rich_markup_mode=None,
 )
 
 
@@ -1118,15 +1254,15 @@ def ralph_main(
     ] = None,
     interval: Annotated[
         float,
-        typer.Option("--interval", "-i", help="Poll interval in seconds."),
+        _INTERVAL_OPTION,
     ] = 1.0,
     preset: Annotated[
         ConfigPreset | None,
-        typer.Option("--preset", help="Use preset configuration (minimal, verbose, debug)."),
+        _PRESET_OPTION,
     ] = None,
     version: Annotated[
         bool | None,
-        typer.Option("--version", callback=version_callback, is_eager=True, help="Show version."),
+        _VERSION_OPTION,
     ] = None,
 ) -> None:
     """Monitor a running Ralph Loop with a live dashboard.
@@ -1142,6 +1278,7 @@ def ralph_main(
     if ctx.invoked_subcommand is not None:
         return
 
+    from cctmux.config import get_preset_config
     from cctmux.ralph_monitor import RalphMonitorConfig, run_ralph_monitor
 
     if preset:
@@ -1192,7 +1329,7 @@ def start(
     ] = None,
     project: Annotated[
         Path | None,
-        typer.Option("--project", "-p", help="Project root directory."),
+        _PROJECT_ROOT_OPTION,
     ] = None,
     timeout: Annotated[
         int,
@@ -1207,7 +1344,7 @@ def start(
     from cctmux.ralph_runner import run_ralph_loop
 
     if not project_file.exists():
-        err_console.print(f"[red]Error:[/] Project file not found: {project_file}")
+        _err_console().print(f"[red]Error:[/] Project file not found: {project_file}")
         raise typer.Exit(1)
 
     run_ralph_loop(
@@ -1238,28 +1375,28 @@ def init(
     from cctmux.ralph_runner import init_project_file
 
     if output.exists():
-        err_console.print(f"[yellow]File already exists:[/] {output}")
+        _err_console().print(f"[yellow]File already exists:[/] {output}")
         raise typer.Exit(1)
 
     init_project_file(output, name=name)
-    console.print(f"[green]✓[/] Created Ralph project file: {output}")
+    _console().print(f"[green]✓[/] Created Ralph project file: {output}")
 
 
 @ralph_app.command()
 def stop(
     project: Annotated[
         Path | None,
-        typer.Option("--project", "-p", help="Project root directory."),
+        _PROJECT_ROOT_OPTION,
     ] = None,
 ) -> None:
     """Stop the Ralph Loop after the current iteration finishes."""
     from cctmux.ralph_runner import stop_ralph_loop
 
-    proj_path = (project or Path.cwd()).resolve()
+    proj_path = _resolve_project(project)
     if stop_ralph_loop(proj_path):
-        console.print("[green]✓[/] Ralph Loop will stop after the current iteration.")
+        _console().print("[green]✓[/] Ralph Loop will stop after the current iteration.")
     else:
-        err_console.print("[yellow]No active Ralph Loop found.[/]")
+        _err_console().print("[yellow]No active Ralph Loop found.[/]")
         raise typer.Exit(1)
 
 
@@ -1267,64 +1404,74 @@ def stop(
 def cancel(
     project: Annotated[
         Path | None,
-        typer.Option("--project", "-p", help="Project root directory."),
+        _PROJECT_ROOT_OPTION,
     ] = None,
 ) -> None:
     """Cancel the active Ralph Loop immediately."""
     from cctmux.ralph_runner import cancel_ralph_loop
 
-    proj_path = (project or Path.cwd()).resolve()
+    proj_path = _resolve_project(project)
     if cancel_ralph_loop(proj_path):
-        console.print("[green]✓[/] Ralph Loop cancelled.")
+        _console().print("[green]✓[/] Ralph Loop cancelled.")
     else:
-        err_console.print("[yellow]No active Ralph Loop found.[/]")
+        _err_console().print("[yellow]No active Ralph Loop found.[/]")
         raise typer.Exit(1)
 
 
+@cache
+def _ralph_status_colors() -> dict[str, str]:
+    """Return the display color for each Ralph status, importing ralph_runner on first use.
+
+    Keys are RalphStatus members; as a StrEnum they also match plain status strings.
+    """
+    from cctmux.ralph_runner import RalphStatus
+
+    return {
+        RalphStatus.ACTIVE: "yellow",
+        RalphStatus.STOPPING: "magenta",
+        RalphStatus.COMPLETED: "green",
+        RalphStatus.CANCELLED: "red",
+        RalphStatus.MAX_REACHED: "cyan",
+        RalphStatus.ERROR: "red",
+        RalphStatus.WAITING: "dim",
+    }
+
+
 @ralph_app.command()
 def status(
     project: Annotated[
         Path | None,
-        typer.Option("--project", "-p", help="Project root directory."),
+        _PROJECT_ROOT_OPTION,
     ] = None,
 ) -> None:
     """Show current Ralph Loop status (one-shot)."""
-    from cctmux.ralph_runner import RalphStatus, load_ralph_state
+    from cctmux.ralph_runner import load_ralph_state
 
-    proj_path = (project or Path.cwd()).resolve()
+    proj_path = _resolve_project(project)
     state = load_ralph_state(proj_path)
 
     if state is None:
-        err_console.print("[yellow]No Ralph Loop state found.[/]")
+        _err_console().print("[yellow]No Ralph Loop state found.[/]")
         raise typer.Exit(1)
 
-    status_colors = {
-        RalphStatus.ACTIVE: "yellow",
-        RalphStatus.STOPPING: "magenta",
-        RalphStatus.COMPLETED: "green",
-        RalphStatus.CANCELLED: "red",
-        RalphStatus.MAX_REACHED: "cyan",
-        RalphStatus.ERROR: "red",
-        RalphStatus.WAITING: "dim",
-    }
-    color = status_colors.get(state.status, "white")  # type: ignore[arg-type]
+    color = _ralph_status_colors().get(state.status, "white")
 
     max_str = f"/{state.max_iterations}" if state.max_iterations > 0 else ""
-    console.print(f"[{color}]Status:[/] {state.status}")
-    console.print(f"Iteration: {state.iteration}{max_str}")
-    console.print(f"Tasks: {state.tasks_completed}/{state.tasks_total}")
+    _console().print(f"[{color}]Status:[/] {state.status}")
+    _console().print(f"Iteration: {state.iteration}{max_str}")
+    _console().print(f"Tasks: {state.tasks_completed}/{state.tasks_total}")
 
     if state.iterations:
-        total_cost = sum(it.get("cost_usd", 0.0) for it in state.iterations)
-        console.print(f"Total cost: ${total_cost:.2f}")
+        _console().print(f"Total cost: ${state.total_cost_usd:.2f}")
 
     if state.completion_promise:
-        console.print(f'Promise: "{state.completion_promise}"')
+        _console().print(f'Promise: "{state.completion_promise}"')
 
 
 config_app = typer.Typer(
     name="config",
     help="Configuration management commands.",
+    rich_markup_mode=None,
 )
 app.add_typer(config_app, name="config")
 
@@ -1333,7 +1480,7 @@ app.add_typer(config_app, name="config")
 def config_validate(
     config_path: Annotated[
         Path | None,
-        typer.Option("--config", "-C", help="Config file path."),
+        _CONFIG_PATH_OPTION,
     ] = None,
     project: Annotated[
         Path | None,
@@ -1341,21 +1488,23 @@ def config_validate(
     ] = None,
 ) -> None:
     """Validate all config files and report warnings."""
-    project_dir = project or Path.cwd()
+    from cctmux.config import display_config_warnings, load_config
+
+    project_dir = _resolve_project(project)
     _config, warnings = load_config(config_path, project_dir=project_dir, strict=True)
 
     if warnings:
-        display_config_warnings(warnings, err_console)
+        display_config_warnings(warnings, _err_console())
         raise typer.Exit(1)
 
-    console.print("[green]✓[/] All config files are valid.")
+    _console().print("[green]✓[/] All config files are valid.")
 
 
 @config_app.command("show")
 def config_show(
     config_path: Annotated[
         Path | None,
-        typer.Option("--config", "-C", help="Config file path."),
+        _CONFIG_PATH_OPTION,
     ] = None,
     project: Annotated[
         Path | None,
@@ -1363,22 +1512,21 @@ def config_show(
     ] = None,
 ) -> None:
     """Show effective merged configuration."""
-    import yaml
+    from cctmux.config import display_config_warnings, dump_config_yaml, load_config
 
-    project_dir = project or Path.cwd()
+    project_dir = _resolve_project(project)
     config, warnings = load_config(config_path, project_dir=project_dir)
 
     if warnings:
-        display_config_warnings(warnings, err_console)
+        display_config_warnings(warnings, _err_console())
 
-    data = config.model_dump()
-    data["default_layout"] = config.default_layout.value
-    console.print(yaml.dump(data, default_flow_style=False))
+    dump_config_yaml(config, _console().file)
 
 
 layout_app = typer.Typer(
     name="layout",
     help="Layout management commands.",
+    rich_markup_mode=None,
 )
 app.add_typer(layout_app, name="layout")
 
@@ -1388,7 +1536,8 @@ def layout_list() -> None:
     """List all available layouts (built-in and custom)."""
     from rich.table import Table
 
-    from cctmux.layouts import LAYOUT_DESCRIPTIONS
+    from cctmux.config import load_config
+    from cctmux.layouts import BUILTIN_LAYOUT_ROWS
 
     config, _warnings = load_config(project_dir=Path.cwd())
 
@@ -1397,16 +1546,14 @@ def layout_list() -> None:
     table.add_column("Type", style="dim")
     table.add_column("Description")
 
-    # Built-in layouts
-    for lt in LayoutType:
-        desc = LAYOUT_DESCRIPTIONS.get(lt, "")
-        table.add_row(lt.value, "built-in", desc)
+    rows = [
+        *((layout_name, "built-in", desc) for layout_name, desc in BUILTIN_LAYOUT_ROWS),
+        *((cl.name, "custom", cl.description) for cl in config.custom_layouts),
+    ]
+    for row in rows:
+        table.add_row(*row)
 
-    # Custom layouts
-    for cl in config.custom_layouts:
-        table.add_row(cl.name, "custom", cl.description)
-
-    console.print(table)
+    _console().print(table)
 
 
 @layout_app.command("show")
@@ -1419,37 +1566,83 @@ def layout_show(
     """Show layout details."""
     import yaml
 
+    from cctmux.config import BUILTIN_LAYOUT_NAMES, load_config, yaml_dumper
     from cctmux.layouts import BUILTIN_TEMPLATES, LAYOUT_DESCRIPTIONS
 
     # Check built-in
-    try:
+    if name in BUILTIN_LAYOUT_NAMES:
         lt = LayoutType(name)
-        console.print(f"[cyan]{name}[/] [dim](built-in)[/]")
+        _console().print(f"[cyan]{name}[/] [dim](built-in)[/]")
         desc = LAYOUT_DESCRIPTIONS.get(lt, "")
         if desc:
-            console.print(f"  {desc}")
+            _console().print(f"  {desc}")
         template = BUILTIN_TEMPLATES.get(lt)
         if template:
-            console.print("\n[dim]Template representation:[/]")
-            splits_data = [s.model_dump() for s in template]
-            console.print(yaml.dump({"splits": splits_data}, default_flow_style=False))
+            _console().print("\n[dim]Template representation:[/]")
+            splits_data = [s.model_dump(mode="json") for s in template]
+            yaml.dump({"splits": splits_data}, _console().file, Dumper=yaml_dumper(), default_flow_style=False)
         return
-    except ValueError:
-        pass
 
     # Check custom
     config, _warnings = load_config(project_dir=Path.cwd())
-    for cl in config.custom_layouts:
-        if cl.name == name:
-            console.print(f"[cyan]{name}[/] [dim](custom)[/]")
-            if cl.description:
-                console.print(f"  {cl.description}")
-            data = cl.model_dump()
-            console.print(yaml.dump(data, default_flow_style=False))
-            return
+    cl = config.custom_layouts_by_name.get(name)
+    if cl is None:
+        _err_console().print(f"[red]Error:[/] Layout '{name}' not found.")
+        raise typer.Exit(1)
+
+    _console().print(f"[cyan]{name}[/] [dim](custom)[/]")
+    if cl.description:
+        _console().print(f"  {cl.description}")
+    yaml.dump(cl.model_dump(mode="json"), _console().file, Dumper=yaml_dumper(), default_flow_style=False)
+
+
+def _require_custom_layout(config: "Config", name: str) -> "CustomLayout":
+    """Look up a custom layout by name, exiting with an error if it is missing.
+
+    Args:
+        config: The loaded configuration.
+        name: The custom layout name.
+
+    Returns:
+        The matching custom layout.
+    """
+    layout = config.custom_layouts_by_name.get(name)
+    if layout is None:
+        _err_console().print(f"[red]Error:[/] Custom layout '{name}' not found.")
+        raise typer.Exit(1)
+    return layout
+
+
+def _has_content(text: str) -> bool:
+    """Check whether edited YAML has anything besides comments and blank lines.
+
+    Args:
+        text: The edited file contents.
 
-    err_console.print(f"[red]Error:[/] Layout '{name}' not found.")
-    raise typer.Exit(1)
+    Returns:
+        True if at least one line is neither blank nor a ``#`` comment.
+    """
+    return any((stripped := line.strip()) and not stripped.startswith("#") for line in text.splitlines())
+
+
+def _open_in_editor(path: str) -> None:
+    """Open a file in ``$EDITOR`` (default ``vi``) and wait for it to exit.
+
+    The editor is run directly rather than through a shell; ``shlex`` splits
+    values such as ``"code --wait"`` into program and arguments.
+
+    Args:
+        path: The file to edit.
+    """
+    import shlex
+    import subprocess
+
+    editor = shlex.split(os.environ.get("EDITOR", "vi")) or ["vi"]
+    try:
+        subprocess.run([*editor, path], check=False)
+    except FileNotFoundError:
+        _err_console().print(f"[red]Error:[/] Editor not found: {editor[0]}")
+        raise typer.Exit(1) from None
 
 
 @layout_app.command("add")
@@ -1464,47 +1657,52 @@ def layout_add(
     ] = None,
 ) -> None:
     """Create a new custom layout."""
-    import os
     import tempfile
 
     import yaml
 
-    from cctmux.layouts import BUILTIN_TEMPLATES
+    from cctmux.config import (
+        BUILTIN_LAYOUT_NAMES,
+        CustomLayout,
+        load_config,
+        save_config,
+        validate_layout_name,
+        yaml_dumper,
+        yaml_loader,
+    )
+    from cctmux.layouts import dumped_template
 
     # Validate name
     try:
         validate_layout_name(name)
     except ValueError as e:
-        err_console.print(f"[red]Error:[/] {e}")
+        _err_console().print(f"[red]Error:[/] {e}")
         raise typer.Exit(1) from None
 
     config, _warnings = load_config(project_dir=Path.cwd())
 
     # Check if name already exists in custom layouts
-    if any(cl.name == name for cl in config.custom_layouts):
-        err_console.print(f"[red]Error:[/] Custom layout '{name}' already exists. Use 'layout edit' to modify.")
+    if name in config.custom_layouts_by_name:
+        _err_console().print(f"[red]Error:[/] Custom layout '{name}' already exists. Use 'layout edit' to modify.")
         raise typer.Exit(1)
 
     # Build template YAML
     if from_layout:
-        # Try built-in
-        try:
-            lt = LayoutType(from_layout)
-            template = BUILTIN_TEMPLATES.get(lt)
-            splits_data = [s.model_dump(exclude_defaults=True) for s in template] if template else []
+        if from_layout in BUILTIN_LAYOUT_NAMES:
+            # Built-in source
             layout_data = {
                 "name": name,
                 "description": f"Custom layout based on {from_layout}",
-                "splits": splits_data,
+                "splits": list(dumped_template(LayoutType(from_layout))),
                 "focus_main": True,
             }
-        except ValueError:
-            # Try custom
-            source = next((cl for cl in config.custom_layouts if cl.name == from_layout), None)
+        else:
+            # Custom source
+            source = config.custom_layouts_by_name.get(from_layout)
             if source is None:
-                err_console.print(f"[red]Error:[/] Source layout '{from_layout}' not found.")
-                raise typer.Exit(1) from None
-            layout_data = source.model_dump()
+                _err_console().print(f"[red]Error:[/] Source layout '{from_layout}' not found.")
+                raise typer.Exit(1)
+            layout_data = source.model_dump(mode="json")
             layout_data["name"] = name
             layout_data["description"] = f"Custom layout based on {from_layout}"
     else:
@@ -1517,10 +1715,9 @@ def layout_add(
             "focus_main": True,
         }
 
-    yaml_content = yaml.dump(layout_data, default_flow_style=False, sort_keys=False)
+    yaml_content = yaml.dump(layout_data, Dumper=yaml_dumper(), default_flow_style=False, sort_keys=False)
 
     # Open in editor
-    editor = os.environ.get("EDITOR", "vi")
     with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False, encoding="utf-8") as f:
         f.write(f"# Custom layout: {name}\n")
         f.write("# Edit this file, save and close to create the layout.\n")
@@ -1529,19 +1726,18 @@ def layout_add(
         tmp_path = f.name
 
     try:
-        os.system(f'{editor} "{tmp_path}"')  # noqa: S605
+        _open_in_editor(tmp_path)
 
         # Read back
-        content = Path(tmp_path).read_text(encoding="utf-8")
-        # Strip comment lines for emptiness check
-        stripped = "\n".join(line for line in content.splitlines() if not line.strip().startswith("#"))
-        if not stripped.strip():
-            console.print("[yellow]Cancelled.[/]")
+        with open(tmp_path, "rb") as f:
+            content = f.read().decode("utf-8")
+        if not _has_content(content):
+            _console().print("[yellow]Cancelled.[/]")
             return
 
-        parsed = yaml.safe_load(content)
+        parsed = yaml.load(content, Loader=yaml_loader())
         if not isinstance(parsed, dict):
-            err_console.print("[red]Error:[/] Invalid YAML — expected a mapping.")
+            _err_console().print("[red]Error:[/] Invalid YAML — expected a mapping.")
             raise typer.Exit(1)
 
         # Validate
@@ -1549,13 +1745,18 @@ def layout_add(
             new_layout = CustomLayout.model_validate(parsed)
             validate_layout_name(new_layout.name)
         except (ValueError, Exception) as e:
-            err_console.print(f"[red]Error:[/] Invalid layout: {e}")
+            _err_console().print(f"[red]Error:[/] Invalid layout: {e}")
             raise typer.Exit(1) from None
 
+        # The name may have been changed in the editor; check the live list
+        if any(cl.name == new_layout.name for cl in config.custom_layouts):
+            _err_console().print(f"[red]Error:[/] Custom layout '{new_layout.name}' already exists.")
+            raise typer.Exit(1)
+
         # Add to config and save
         config.custom_layouts.append(new_layout)
         save_config(config)
-        console.print(f"[green]✓[/] Custom layout '{new_layout.name}' added.")
+        _console().print(f"[green]✓[/] Custom layout '{new_layout.name}' added.")
     finally:
         Path(tmp_path).unlink(missing_ok=True)
 
@@ -1568,24 +1769,19 @@ def layout_remove(
     ],
 ) -> None:
     """Remove a custom layout."""
+    from cctmux.config import BUILTIN_LAYOUT_NAMES, load_config, save_config
+
     # Prevent removing built-in
-    try:
-        LayoutType(name)
-        err_console.print(f"[red]Error:[/] '{name}' is a built-in layout and cannot be removed.")
+    if name in BUILTIN_LAYOUT_NAMES:
+        _err_console().print(f"[red]Error:[/] '{name}' is a built-in layout and cannot be removed.")
         raise typer.Exit(1)
-    except ValueError:
-        pass
 
     config, _warnings = load_config(project_dir=Path.cwd())
-    original_count = len(config.custom_layouts)
+    _require_custom_layout(config, name)
     config.custom_layouts = [cl for cl in config.custom_layouts if cl.name != name]
 
-    if len(config.custom_layouts) == original_count:
-        err_console.print(f"[red]Error:[/] Custom layout '{name}' not found.")
-        raise typer.Exit(1)
-
     save_config(config)
-    console.print(f"[green]✓[/] Custom layout '{name}' removed.")
+    _console().print(f"[green]✓[/] Custom layout '{name}' removed.")
 
 
 @layout_app.command("edit")
@@ -1596,30 +1792,31 @@ def layout_edit(
     ],
 ) -> None:
     """Edit an existing custom layout."""
-    import os
     import tempfile
 
     import yaml
 
+    from cctmux.config import (
+        BUILTIN_LAYOUT_NAMES,
+        CustomLayout,
+        load_config,
+        save_config,
+        validate_layout_name,
+        yaml_dumper,
+        yaml_loader,
+    )
+
     # Prevent editing built-in
-    try:
-        LayoutType(name)
-        err_console.print(f"[red]Error:[/] '{name}' is a built-in layout and cannot be edited.")
+    if name in BUILTIN_LAYOUT_NAMES:
+        _err_console().print(f"[red]Error:[/] '{name}' is a built-in layout and cannot be edited.")
         raise typer.Exit(1)
-    except ValueError:
-        pass
 
     config, _warnings = load_config(project_dir=Path.cwd())
-    layout_idx = next((i for i, cl in enumerate(config.custom_layouts) if cl.name == name), None)
-
-    if layout_idx is None:
-        err_console.print(f"[red]Error:[/] Custom layout '{name}' not found.")
-        raise typer.Exit(1)
-
-    current = config.custom_layouts[layout_idx]
-    yaml_content = yaml.dump(current.model_dump(), default_flow_style=False, sort_keys=False)
+    current = _require_custom_layout(config, name)
+    yaml_content = yaml.dump(
+        current.model_dump(mode="json"), Dumper=yaml_dumper(), default_flow_style=False, sort_keys=False
+    )
 
-    editor = os.environ.get("EDITOR", "vi")
     with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False, encoding="utf-8") as f:
         f.write(f"# Editing custom layout: {name}\n")
         f.write("# Save and close to apply changes. Delete all content to cancel.\n\n")
@@ -1627,29 +1824,34 @@ def layout_edit(
         tmp_path = f.name
 
     try:
-        os.system(f'{editor} "{tmp_path}"')  # noqa: S605
+        _open_in_editor(tmp_path)
 
-        content = Path(tmp_path).read_text(encoding="utf-8")
-        stripped = "\n".join(line for line in content.splitlines() if not line.strip().startswith("#"))
-        if not stripped.strip():
-            console.print("[yellow]Cancelled.[/]")
+        with open(tmp_path, "rb") as f:
+            content = f.read().decode("utf-8")
+        if not _has_content(content):
+            _console().print("[yellow]Cancelled.[/]")
             return
 
-        parsed = yaml.safe_load(content)
+        parsed = yaml.load(content, Loader=yaml_loader())
         if not isinstance(parsed, dict):
-            err_console.print("[red]Error:[/] Invalid YAML — expected a mapping.")
+            _err_console().print("[red]Error:[/] Invalid YAML — expected a mapping.")
             raise typer.Exit(1)
 
         try:
             updated_layout = CustomLayout.model_validate(parsed)
             validate_layout_name(updated_layout.name)
         except (ValueError, Exception) as e:
-            err_console.print(f"[red]Error:[/] Invalid layout: {e}")
+            _err_console().print(f"[red]Error:[/] Invalid layout: {e}")
             raise typer.Exit(1) from None
 
-        config.custom_layouts[layout_idx] = updated_layout
+        # A rename must not collide with any other layout in the live list
+        if any(cl.name == updated_layout.name for cl in config.custom_layouts if cl is not current):
+            _err_console().print(f"[red]Error:[/] Custom layout '{updated_layout.name}' already exists.")
+            raise typer.Exit(1)
+
+        config.custom_layouts[config.custom_layouts.index(current)] = updated_layout
         save_config(config)
-        console.print(f"[green]✓[/] Custom layout '{updated_layout.name}' updated.")
+        _console().print(f"[green]✓[/] Custom layout '{updated_layout.name}' updated.")
     finally:
         Path(tmp_path).unlink(missing_ok=True)
 
@@ -1657,6 +1859,7 @@ def layout_edit(
 team_app = typer.Typer(
     name="team",
     help="Launch a team of Claude Code instances.",
+    rich_markup_mode=None,
 )
 app.add_typer(team_app, name="team")
 
@@ -1677,52 +1880,55 @@ def team_launch(
     If TEAM_FILE is provided, load team config from that YAML file.
     Otherwise, look for a 'team:' section in .cctmux.yaml.
     """
+    from cctmux.config import TeamConfig, display_config_warnings, load_config, load_team_config
+    from cctmux.tmux_manager import create_team_session, is_inside_tmux, session_exists
+
     project_dir = Path.cwd()
 
     # Resolve team configuration
     team: TeamConfig | None = None
     if team_file is not None:
         if not team_file.exists():
-            err_console.print(f"[red]Error:[/] Team file not found: {team_file}")
+            _err_console().print(f"[red]Error:[/] Team file not found: {team_file}")
             raise typer.Exit(1)
         try:
             team = load_team_config(team_file)
         except (ValueError, FileNotFoundError) as e:
-            err_console.print(f"[red]Error:[/] Failed to load team config: {e}")
+            _err_console().print(f"[red]Error:[/] Failed to load team config: {e}")
             raise typer.Exit(1) from None
     else:
         config, config_warnings = load_config(project_dir=project_dir)
         if config_warnings:
-            display_config_warnings(config_warnings, err_console)
+            display_config_warnings(config_warnings, _err_console())
         team = config.team
 
     if team is None:
-        err_console.print("[red]Error:[/] No team configuration found.")
-        err_console.print("[dim]Provide a team YAML file or add a 'team:' section to .cctmux.yaml.[/]")
+        _err_console().print("[red]Error:[/] No team configuration found.")
+        _err_console().print("[dim]Provide a team YAML file or add a 'team:' section to .cctmux.yaml.[/]")
         raise typer.Exit(1)
 
     # Derive session name (same sanitization as the main launcher)
     session_name = sanitize_session_name(get_project_name(project_dir))
 
     if debug or verbose > 0:
-        console.print(f"[dim]Session: {session_name}[/]")
-        console.print(f"[dim]Project: {project_dir}[/]")
-        console.print(f"[dim]Agents: {len(team.agents)}[/]")
+        _console().print(f"[dim]Session: {session_name}[/]")
+        _console().print(f"[dim]Project: {project_dir}[/]")
+        _console().print(f"[dim]Agents: {len(team.agents)}[/]")
 
     # Refuse to launch from inside tmux
     if is_inside_tmux():
-        err_console.print("[red]Error:[/] Already inside a tmux session.")
-        err_console.print("[dim]Use standard tmux commands to manage panes.[/]")
+        _err_console().print("[red]Error:[/] Already inside a tmux session.")
+        _err_console().print("[dim]Use standard tmux commands to manage panes.[/]")
         raise typer.Exit(1)
 
     # Check for existing session
     if session_exists(session_name):
-        err_console.print(f"[yellow]Session already exists:[/] {session_name}")
-        err_console.print("[dim]Attach with: tmux attach -t {session_name}[/]")
+        _err_console().print(f"[yellow]Session already exists:[/] {session_name}")
+        _err_console().print("[dim]Attach with: tmux attach -t {session_name}[/]")
         raise typer.Exit(1)
 
     if verbose > 0 or dry_run:
-        console.print(f"[green]Creating team session:[/] {session_name}")
+        _console().print(f"[green]Creating team session:[/] {session_name}")
 
     commands = create_team_session(
         session_name=session_name,
@@ -1733,16 +1939,17 @@ def team_launch(
     )
 
     if dry_run:
-        console.print("[yellow]Commands that would be executed:[/]")
+        _console().print("[yellow]Commands that would be executed:[/]")
         for cmd in commands:
-            console.print(f"  {cmd}")
-        console.print("[dim]Note: Actual execution uses pane IDs (%%N) for reliable targeting.[/]")
+            _console().print(f"  {cmd}")
+        _console().print("[dim]Note: Actual execution uses pane IDs (%%N) for reliable targeting.[/]")
 
 
 pi_app = typer.Typer(
     name="pitmux",
     help="Launch the pi coding agent inside tmux with session management.",
     no_args_is_help=False,
+    rich_markup_mode=None,
 )
 
 
@@ -1750,22 +1957,24 @@ pi_app = typer.Typer(
 def pi_install_skill() -> None:
     """Install bundled pi-tmux skill to ~/.pi/agent/skills/."""
     _sync_pi_skill()
-    console.print("[green]✓[/] pi-tmux skill installed.")
+    _console().print("[green]✓[/] pi-tmux skill installed.")
 
 
 @pi_app.command("init-config")
 def pi_init_config() -> None:
     """Create default configuration file."""
+    from cctmux.config import Config, save_config
+
     ensure_directories()
     config_file = get_config_file_path()
 
     if config_file.exists():
-        err_console.print(f"[yellow]Config file already exists:[/] {config_file}")
+        _err_console().print(f"[yellow]Config file already exists:[/] {config_file}")
         raise typer.Exit(1)
 
     config = Config()
     save_config(config)
-    console.print(f"[green]✓[/] Created config file: {config_file}")
+    _console().print(f"[green]✓[/] Created config file: {config_file}")
 
 
 @pi_app.callback(invoke_without_command=True)
@@ -1801,7 +2010,7 @@ def pi_main(
     ] = False,
     config_path: Annotated[
         Path | None,
-        typer.Option("--config", "-C", help="Config file path."),
+        _CONFIG_PATH_OPTION,
     ] = None,
     continue_session: Annotated[
         bool,
@@ -1825,7 +2034,7 @@ def pi_main(
     ] = False,
     version: Annotated[
         bool | None,
-        typer.Option("--version", callback=version_callback, is_eager=True, help="Show version."),
+        _VERSION_OPTION,
     ] = None,
 ) -> None:
     """Launch the pi coding agent in a tmux session for the current directory."""
@@ -1835,21 +2044,28 @@ def pi_main(
     if ctx.invoked_subcommand is not None:
         return
 
+    from cctmux.config import BUILTIN_LAYOUT_NAMES, display_config_warnings, dump_config_yaml, load_config
+    from cctmux.session_history import (
+        add_or_update_entry,
+        get_entry_by_name,
+        get_recent_session_names,
+        load_history,
+        save_history,
+    )
+    from cctmux.tmux_manager import attach_session, create_pi_session, is_inside_tmux, session_exists
+
     ensure_directories()
 
-    config, config_warnings = load_config(config_path, project_dir=Path.cwd(), strict=strict)
+    cwd = Path.cwd()
+    config, config_warnings = load_config(config_path, project_dir=cwd, strict=strict)
 
     if config_warnings:
-        display_config_warnings(config_warnings, err_console)
+        display_config_warnings(config_warnings, _err_console())
         if strict:
             raise typer.Exit(1)
 
     if dump_config:
-        import yaml
-
-        data = config.model_dump()
-        data["default_layout"] = config.default_layout.value
-        console.print(yaml.dump(data, default_flow_style=False))
+        dump_config_yaml(config, _console().file)
         raise typer.Exit()
 
     # Merge CLI args with config (CLI takes precedence)
@@ -1858,33 +2074,22 @@ def pi_main(
     else:
         effective_layout = config.default_layout
     effective_status_bar = status_bar or config.status_bar_enabled
-    effective_pi_args = pi_args if pi_args else config.default_pi_args
-    if resume:
-        resume_flag = "--resume"
-        if effective_pi_args:
-            if resume_flag not in effective_pi_args:
-                effective_pi_args = f"{effective_pi_args} {resume_flag}"
-        else:
-            effective_pi_args = resume_flag
-    if continue_session:
-        continue_flag = "--continue"
-        if effective_pi_args:
-            if continue_flag not in effective_pi_args:
-                effective_pi_args = f"{effective_pi_args} {continue_flag}"
-        else:
-            effective_pi_args = continue_flag
+    effective_pi_args = _append_cli_flags(
+        pi_args if pi_args else config.default_pi_args,
+        ((resume, "--resume"), (continue_session, "--continue")),
+    )
 
     if debug or verbose > 1:
-        console.print(f"[dim]Config file: {get_config_file_path()}[/]")
+        _console().print(f"[dim]Config file: {get_config_file_path()}[/]")
         layout_display = effective_layout.value if isinstance(effective_layout, LayoutType) else effective_layout
-        console.print(f"[dim]Layout: {layout_display}[/]")
-        console.print(f"[dim]Status bar: {effective_status_bar}[/]")
+        _console().print(f"[dim]Layout: {layout_display}[/]")
+        _console().print(f"[dim]Status bar: {effective_status_bar}[/]")
         if effective_pi_args:
-            console.print(f"[dim]pi args: {effective_pi_args}[/]")
+            _console().print(f"[dim]pi args: {effective_pi_args}[/]")
 
     if is_inside_tmux():
-        err_console.print("[red]Error:[/] Already inside a tmux session.")
-        err_console.print("[dim]Use standard tmux commands to manage panes.[/]")
+        _err_console().print("[red]Error:[/] Already inside a tmux session.")
+        _err_console().print("[dim]Use standard tmux commands to manage panes.[/]")
         raise typer.Exit(1)
 
     history = load_history()
@@ -1894,12 +2099,12 @@ def pi_main(
 
     if recent:
         if not is_fzf_available():
-            err_console.print("[red]Error:[/] fzf is required for --recent but not installed.")
+            _err_console().print("[red]Error:[/] fzf is required for --recent but not installed.")
             raise typer.Exit(1)
 
         recent_names = get_recent_session_names(history)
         if not recent_names:
-            err_console.print("[yellow]No recent sessions found.[/]")
+            _err_console().print("[yellow]No recent sessions found.[/]")
             raise typer.Exit(1)
 
         selected = select_with_fzf(recent_names, prompt="Session: ")
@@ -1911,13 +2116,13 @@ def pi_main(
         if entry:
             project_dir = Path(entry.project_dir)
             if not project_dir.exists():
-                err_console.print(f"[yellow]Warning:[/] Project directory no longer exists: {entry.project_dir}")
-                err_console.print("[dim]Falling back to current directory.[/]")
-                project_dir = Path.cwd()
+                _err_console().print(f"[yellow]Warning:[/] Project directory no longer exists: {entry.project_dir}")
+                _err_console().print("[dim]Falling back to current directory.[/]")
+                project_dir = cwd
         else:
-            project_dir = Path.cwd()
+            project_dir = cwd
     else:
-        project_dir = Path.cwd()
+        project_dir = cwd
         base_name = get_project_name(project_dir)
         session_name = sanitize_session_name(f"{config.pi_session_prefix}{base_name}")
 
@@ -1932,32 +2137,28 @@ def pi_main(
         )
 
     if debug or verbose > 0:
-        console.print(f"[dim]Session: {session_name}[/]")
-        console.print(f"[dim]Project: {project_dir}[/]")
+        _console().print(f"[dim]Session: {session_name}[/]")
+        _console().print(f"[dim]Project: {project_dir}[/]")
 
     if session_exists(session_name):
         if verbose > 0 or dry_run:
-            console.print(f"[blue]Attaching to existing session:[/] {session_name}")
+            _console().print(f"[blue]Attaching to existing session:[/] {session_name}")
 
         commands = attach_session(session_name, dry_run=dry_run)
 
         if dry_run:
-            console.print("[yellow]Commands that would be executed:[/]")
+            _console().print("[yellow]Commands that would be executed:[/]")
             for cmd in commands:
-                console.print(f"  {cmd}")
+                _console().print(f"  {cmd}")
     else:
         if verbose > 0 or dry_run:
-            console.print(f"[green]Creating new session:[/] {session_name}")
+            _console().print(f"[green]Creating new session:[/] {session_name}")
 
         # Validate layout name against built-in and custom layouts
-        try:
-            LayoutType(effective_layout)
-        except ValueError:
-            custom_match = [cl for cl in config.custom_layouts if cl.name == effective_layout]
-            if not custom_match:
-                err_console.print(f"[red]Error:[/] Unknown layout: {effective_layout}")
-                err_console.print("[dim]Use 'cctmux layout list' to see available layouts.[/]")
-                raise typer.Exit(1) from None
+        if effective_layout not in BUILTIN_LAYOUT_NAMES and effective_layout not in config.custom_layouts_by_name:
+            _err_console().print(f"[red]Error:[/] Unknown layout: {effective_layout}")
+            _err_console().print("[dim]Use 'cctmux layout list' to see available layouts.[/]")
+            raise typer.Exit(1)
 
         commands = create_pi_session(
             session_name=session_name,
@@ -1970,10 +2171,10 @@ def pi_main(
         )
 
         if dry_run:
-            console.print("[yellow]Commands that would be executed:[/]")
+            _console().print("[yellow]Commands that would be executed:[/]")
             for cmd in commands:
-                console.print(f"  {cmd}")
-            console.print("[dim]Note: Actual execution uses pane IDs (%%N) for reliable targeting.[/]")
+                _console().print(f"  {cmd}")
+            _console().print("[dim]Note: Actual execution uses pane IDs (%%N) for reliable targeting.[/]")
 
     if not dry_run:
         history = add_or_update_entry(
@@ -1989,22 +2190,25 @@ cdx_app = typer.Typer(
     name="cdxtmux",
     help="Launch the codex CLI inside tmux with session management.",
     no_args_is_help=False,
+    rich_markup_mode=None,
 )
 
 
 @cdx_app.command("init-config")
 def cdx_init_config() -> None:
     """Create default configuration file."""
+    from cctmux.config import Config, save_config
+
     ensure_directories()
     config_file = get_config_file_path()
 
     if config_file.exists():
-        err_console.print(f"[yellow]Config file already exists:[/] {config_file}")
+        _err_console().print(f"[yellow]Config file already exists:[/] {config_file}")
         raise typer.Exit(1)
 
     config = Config()
     save_config(config)
-    console.print(f"[green]✓[/] Created config file: {config_file}")
+    _console().print(f"[green]✓[/] Created config file: {config_file}")
 
 
 @cdx_app.callback(invoke_without_command=True)
@@ -2040,7 +2244,7 @@ def cdx_main(
     ] = False,
     config_path: Annotated[
         Path | None,
-        typer.Option("--config", "-C", help="Config file path."),
+        _CONFIG_PATH_OPTION,
     ] = None,
     continue_session: Annotated[
         bool,
@@ -2072,28 +2276,35 @@ def cdx_main(
     ] = False,
     version: Annotated[
         bool | None,
-        typer.Option("--version", callback=version_callback, is_eager=True, help="Show version."),
+        _VERSION_OPTION,
     ] = None,
 ) -> None:
     """Launch the codex CLI in a tmux session for the current directory."""
     if ctx.invoked_subcommand is not None:
         return
 
+    from cctmux.config import BUILTIN_LAYOUT_NAMES, display_config_warnings, dump_config_yaml, load_config
+    from cctmux.session_history import (
+        add_or_update_entry,
+        get_entry_by_name,
+        get_recent_session_names,
+        load_history,
+        save_history,
+    )
+    from cctmux.tmux_manager import attach_session, create_codex_session, is_inside_tmux, session_exists
+
     ensure_directories()
 
-    config, config_warnings = load_config(config_path, project_dir=Path.cwd(), strict=strict)
+    cwd = Path.cwd()
+    config, config_warnings = load_config(config_path, project_dir=cwd, strict=strict)
 
     if config_warnings:
-        display_config_warnings(config_warnings, err_console)
+        display_config_warnings(config_warnings, _err_console())
         if strict:
             raise typer.Exit(1)
 
     if dump_config:
-        import yaml
-
-        data = config.model_dump()
-        data["default_layout"] = config.default_layout.value
-        console.print(yaml.dump(data, default_flow_style=False))
+        dump_config_yaml(config, _console().file)
         raise typer.Exit()
 
     if layout != "default":
@@ -2101,14 +2312,10 @@ def cdx_main(
     else:
         effective_layout = config.default_layout
     effective_status_bar = status_bar or config.status_bar_enabled
-    effective_codex_args = codex_args if codex_args else config.default_codex_args
-    if yolo:
-        yolo_flag = "--dangerously-bypass-approvals-and-sandbox"
-        if effective_codex_args:
-            if yolo_flag not in effective_codex_args:
-                effective_codex_args = f"{effective_codex_args} {yolo_flag}"
-        else:
-            effective_codex_args = yolo_flag
+    effective_codex_args = _append_cli_flags(
+        codex_args if codex_args else config.default_codex_args,
+        ((yolo, "--dangerously-bypass-approvals-and-sandbox"),),
+    )
 
     # Codex resume is a subcommand, not a flag — track it separately
     if continue_session:
@@ -2119,17 +2326,17 @@ def cdx_main(
         resume_mode = "none"
 
     if debug or verbose > 1:
-        console.print(f"[dim]Config file: {get_config_file_path()}[/]")
+        _console().print(f"[dim]Config file: {get_config_file_path()}[/]")
         layout_display = effective_layout.value if isinstance(effective_layout, LayoutType) else effective_layout
-        console.print(f"[dim]Layout: {layout_display}[/]")
-        console.print(f"[dim]Status bar: {effective_status_bar}[/]")
-        console.print(f"[dim]Resume mode: {resume_mode}[/]")
+        _console().print(f"[dim]Layout: {layout_display}[/]")
+        _console().print(f"[dim]Status bar: {effective_status_bar}[/]")
+        _console().print(f"[dim]Resume mode: {resume_mode}[/]")
         if effective_codex_args:
-            console.print(f"[dim]codex args: {effective_codex_args}[/]")
+            _console().print(f"[dim]codex args: {effective_codex_args}[/]")
 
     if is_inside_tmux():
-        err_console.print("[red]Error:[/] Already inside a tmux session.")
-        err_console.print("[dim]Use standard tmux commands to manage panes.[/]")
+        _err_console().print("[red]Error:[/] Already inside a tmux session.")
+        _err_console().print("[dim]Use standard tmux commands to manage panes.[/]")
         raise typer.Exit(1)
 
     history = load_history()
@@ -2139,12 +2346,12 @@ def cdx_main(
 
     if recent:
         if not is_fzf_available():
-            err_console.print("[red]Error:[/] fzf is required for --recent but not installed.")
+            _err_console().print("[red]Error:[/] fzf is required for --recent but not installed.")
             raise typer.Exit(1)
 
         recent_names = get_recent_session_names(history)
         if not recent_names:
-            err_console.print("[yellow]No recent sessions found.[/]")
+            _err_console().print("[yellow]No recent sessions found.[/]")
             raise typer.Exit(1)
 
         selected = select_with_fzf(recent_names, prompt="Session: ")
@@ -2156,13 +2363,13 @@ def cdx_main(
         if entry:
             project_dir = Path(entry.project_dir)
             if not project_dir.exists():
-                err_console.print(f"[yellow]Warning:[/] Project directory no longer exists: {entry.project_dir}")
-                err_console.print("[dim]Falling back to current directory.[/]")
-                project_dir = Path.cwd()
+                _err_console().print(f"[yellow]Warning:[/] Project directory no longer exists: {entry.project_dir}")
+                _err_console().print("[dim]Falling back to current directory.[/]")
+                project_dir = cwd
         else:
-            project_dir = Path.cwd()
+            project_dir = cwd
     else:
-        project_dir = Path.cwd()
+        project_dir = cwd
         base_name = get_project_name(project_dir)
         session_name = sanitize_session_name(f"{config.codex_session_prefix}{base_name}")
 
@@ -2177,31 +2384,27 @@ def cdx_main(
         )
 
     if debug or verbose > 0:
-        console.print(f"[dim]Session: {session_name}[/]")
-        console.print(f"[dim]Project: {project_dir}[/]")
+        _console().print(f"[dim]Session: {session_name}[/]")
+        _console().print(f"[dim]Project: {project_dir}[/]")
 
     if session_exists(session_name):
         if verbose > 0 or dry_run:
-            console.print(f"[blue]Attaching to existing session:[/] {session_name}")
+            _console().print(f"[blue]Attaching to existing session:[/] {session_name}")
 
         commands = attach_session(session_name, dry_run=dry_run)
 
         if dry_run:
-            console.print("[yellow]Commands that would be executed:[/]")
+            _console().print("[yellow]Commands that would be executed:[/]")
             for cmd in commands:
-                console.print(f"  {cmd}")
+                _console().print(f"  {cmd}")
     else:
         if verbose > 0 or dry_run:
-            console.print(f"[green]Creating new session:[/] {session_name}")
+            _console().print(f"[green]Creating new session:[/] {session_name}")
 
-        try:
-            LayoutType(effective_layout)
-        except ValueError:
-            custom_match = [cl for cl in config.custom_layouts if cl.name == effective_layout]
-            if not custom_match:
-                err_console.print(f"[red]Error:[/] Unknown layout: {effective_layout}")
-                err_console.print("[dim]Use 'cctmux layout list' to see available layouts.[/]")
-                raise typer.Exit(1) from None
+        if effective_layout not in BUILTIN_LAYOUT_NAMES and effective_layout not in config.custom_layouts_by_name:
+            _err_console().print(f"[red]Error:[/] Unknown layout: {effective_layout}")
+            _err_console().print("[dim]Use 'cctmux layout list' to see available layouts.[/]")
+            raise typer.Exit(1)
 
         commands = create_codex_session(
             session_name=session_name,
@@ -2215,10 +2418,10 @@ def cdx_main(
         )
 
         if dry_run:
-            console.print("[yellow]Commands that would be executed:[/]")
+            _console().print("[yellow]Commands that would be executed:[/]")
             for cmd in commands:
-                console.print(f"  {cmd}")
-            console.print("[dim]Note: Actual execution uses pane IDs (%%N) for reliable targeting.[/]")
+                _console().print(f"  {cmd}")
+            _console().print("[dim]Note: Actual execution uses pane IDs (%%N) for reliable targeting.[/]")
 
     if not dry_run:
         history = add_or_update_entry(
@@ -2234,22 +2437,25 @@ gem_app = typer.Typer(
     name="gemtmux",
     help="Launch the gemini CLI inside tmux with session management.",
     no_args_is_help=False,
+    rich_markup_mode=None,
 )
 
 
 @gem_app.command("init-config")
 def gem_init_config() -> None:
     """Create default configuration file."""
+    from cctmux.config import Config, save_config
+
     ensure_directories()
     config_file = get_config_file_path()
 
     if config_file.exists():
-        err_console.print(f"[yellow]Config file already exists:[/] {config_file}")
+        _err_console().print(f"[yellow]Config file already exists:[/] {config_file}")
         raise typer.Exit(1)
 
     config = Config()
     save_config(config)
-    console.print(f"[green]✓[/] Created config file: {config_file}")
+    _console().print(f"[green]✓[/] Created config file: {config_file}")
 
 
 @gem_app.callback(invoke_without_command=True)
@@ -2290,7 +2496,7 @@ def gem_main(
     ] = False,
     config_path: Annotated[
         Path | None,
-        typer.Option("--config", "-C", help="Config file path."),
+        _CONFIG_PATH_OPTION,
     ] = None,
     continue_session: Annotated[
         bool,
@@ -2320,28 +2526,35 @@ def gem_main(
     ] = False,
     version: Annotated[
         bool | None,
-        typer.Option("--version", callback=version_callback, is_eager=True, help="Show version."),
+        _VERSION_OPTION,
     ] = None,
 ) -> None:
     """Launch the gemini CLI in a tmux session for the current directory."""
     if ctx.invoked_subcommand is not None:
         return
 
+    from cctmux.config import BUILTIN_LAYOUT_NAMES, display_config_warnings, dump_config_yaml, load_config
+    from cctmux.session_history import (
+        add_or_update_entry,
+        get_entry_by_name,
+        get_recent_session_names,
+        load_history,
+        save_history,
+    )
+    from cctmux.tmux_manager import attach_session, create_gemini_session, is_inside_tmux, session_exists
+
     ensure_directories()
 
-    config, config_warnings = load_config(config_path, project_dir=Path.cwd(), strict=strict)
+    cwd = Path.cwd()
+    config, config_warnings = load_config(config_path, project_dir=cwd, strict=strict)
 
     if config_warnings:
-        display_config_warnings(config_warnings, err_console)
+        display_config_warnings(config_warnings, _err_console())
         if strict:
             raise typer.Exit(1)
 
     if dump_config:
-        import yaml
-
-        data = config.model_dump()
-        data["default_layout"] = config.default_layout.value
-        console.print(yaml.dump(data, default_flow_style=False))
+        dump_config_yaml(config, _console().file)
         raise typer.Exit()
 
     if layout != "default":
@@ -2349,37 +2562,25 @@ def gem_main(
     else:
         effective_layout = config.default_layout
     effective_status_bar = status_bar or config.status_bar_enabled
-    effective_gemini_args = gemini_args if gemini_args else config.default_gemini_args
-
     # Gemini's --resume takes a value (latest|<index>); both -c and -r map to "latest"
     # since gemini lacks an interactive picker. Users wanting a specific index can
     # pass it via --gemini-args.
-    if continue_session or resume:
-        resume_flag = "--resume latest"
-        if effective_gemini_args:
-            if "--resume" not in effective_gemini_args:
-                effective_gemini_args = f"{effective_gemini_args} {resume_flag}"
-        else:
-            effective_gemini_args = resume_flag
-    if yolo:
-        yolo_flag = "--yolo"
-        if effective_gemini_args:
-            if yolo_flag not in effective_gemini_args:
-                effective_gemini_args = f"{effective_gemini_args} {yolo_flag}"
-        else:
-            effective_gemini_args = yolo_flag
+    effective_gemini_args = _append_cli_flags(
+        gemini_args if gemini_args else config.default_gemini_args,
+        ((continue_session or resume, "--resume latest"), (yolo, "--yolo")),
+    )
 
     if debug or verbose > 1:
-        console.print(f"[dim]Config file: {get_config_file_path()}[/]")
+        _console().print(f"[dim]Config file: {get_config_file_path()}[/]")
         layout_display = effective_layout.value if isinstance(effective_layout, LayoutType) else effective_layout
-        console.print(f"[dim]Layout: {layout_display}[/]")
-        console.print(f"[dim]Status bar: {effective_status_bar}[/]")
+        _console().print(f"[dim]Layout: {layout_display}[/]")
+        _console().print(f"[dim]Status bar: {effective_status_bar}[/]")
         if effective_gemini_args:
-            console.print(f"[dim]gemini args: {effective_gemini_args}[/]")
+            _console().print(f"[dim]gemini args: {effective_gemini_args}[/]")
 
     if is_inside_tmux():
-        err_console.print("[red]Error:[/] Already inside a tmux session.")
-        err_console.print("[dim]Use standard tmux commands to manage panes.[/]")
+        _err_console().print("[red]Error:[/] Already inside a tmux session.")
+        _err_console().print("[dim]Use standard tmux commands to manage panes.[/]")
         raise typer.Exit(1)
 
     history = load_history()
@@ -2389,12 +2590,12 @@ def gem_main(
 
     if recent:
         if not is_fzf_available():
-            err_console.print("[red]Error:[/] fzf is required for --recent but not installed.")
+            _err_console().print("[red]Error:[/] fzf is required for --recent but not installed.")
             raise typer.Exit(1)
 
         recent_names = get_recent_session_names(history)
         if not recent_names:
-            err_console.print("[yellow]No recent sessions found.[/]")
+            _err_console().print("[yellow]No recent sessions found.[/]")
             raise typer.Exit(1)
 
         selected = select_with_fzf(recent_names, prompt="Session: ")
@@ -2406,13 +2607,13 @@ def gem_main(
         if entry:
             project_dir = Path(entry.project_dir)
             if not project_dir.exists():
-                err_console.print(f"[yellow]Warning:[/] Project directory no longer exists: {entry.project_dir}")
-                err_console.print("[dim]Falling back to current directory.[/]")
-                project_dir = Path.cwd()
+                _err_console().print(f"[yellow]Warning:[/] Project directory no longer exists: {entry.project_dir}")
+                _err_console().print("[dim]Falling back to current directory.[/]")
+                project_dir = cwd
         else:
-            project_dir = Path.cwd()
+            project_dir = cwd
     else:
-        project_dir = Path.cwd()
+        project_dir = cwd
         base_name = get_project_name(project_dir)
         session_name = sanitize_session_name(f"{config.gemini_session_prefix}{base_name}")
 
@@ -2427,31 +2628,27 @@ def gem_main(
         )
 
     if debug or verbose > 0:
-        console.print(f"[dim]Session: {session_name}[/]")
-        console.print(f"[dim]Project: {project_dir}[/]")
+        _console().print(f"[dim]Session: {session_name}[/]")
+        _console().print(f"[dim]Project: {project_dir}[/]")
 
     if session_exists(session_name):
         if verbose > 0 or dry_run:
-            console.print(f"[blue]Attaching to existing session:[/] {session_name}")
+            _console().print(f"[blue]Attaching to existing session:[/] {session_name}")
 
         commands = attach_session(session_name, dry_run=dry_run)
 
         if dry_run:
-            console.print("[yellow]Commands that would be executed:[/]")
+            _console().print("[yellow]Commands that would be executed:[/]")
             for cmd in commands:
-                console.print(f"  {cmd}")
+                _console().print(f"  {cmd}")
     else:
         if verbose > 0 or dry_run:
-            console.print(f"[green]Creating new session:[/] {session_name}")
+            _console().print(f"[green]Creating new session:[/] {session_name}")
 
-        try:
-            LayoutType(effective_layout)
-        except ValueError:
-            custom_match = [cl for cl in config.custom_layouts if cl.name == effective_layout]
-            if not custom_match:
-                err_console.print(f"[red]Error:[/] Unknown layout: {effective_layout}")
-                err_console.print("[dim]Use 'cctmux layout list' to see available layouts.[/]")
-                raise typer.Exit(1) from None
+        if effective_layout not in BUILTIN_LAYOUT_NAMES and effective_layout not in config.custom_layouts_by_name:
+            _err_console().print(f"[red]Error:[/] Unknown layout: {effective_layout}")
+            _err_console().print("[dim]Use 'cctmux layout list' to see available layouts.[/]")
+            raise typer.Exit(1)
 
         commands = create_gemini_session(
             session_name=session_name,
@@ -2464,10 +2661,10 @@ def gem_main(
         )
 
         if dry_run:
-            console.print("[yellow]Commands that would be executed:[/]")
+            _console().print("[yellow]Commands that would be executed:[/]")
             for cmd in commands:
-                console.print(f"  {cmd}")
-            console.print("[dim]Note: Actual execution uses pane IDs (%%N) for reliable targeting.[/]")
+                _console().print(f"  {cmd}")
+            _console().print("[dim]Note: Actual execution uses pane IDs (%%N) for reliable targeting.[/]")
 
     if not dry_run:
         history = add_or_update_entry(
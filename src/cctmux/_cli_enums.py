@@ -0,0 +1,31 @@
+"""Enums used in CLI option signatures.
+
+Kept free of third-party imports so the CLI can declare its options without
+loading pydantic, PyYAML or rich. Re-exported from ``cctmux.config``.
+"""
+
+from enum import StrEnum
+
+
+class LayoutType(StrEnum):
+    """Available tmux layout types."""
+
+    DEFAULT = "default"  # No initial split
+    EDITOR = "editor"  # 70/30 horizontal split
+    MONITOR = "monitor"  # Main + bottom bar (80/20)
+    TRIPLE = "triple"  # Main + 2 side panes
+    CC_MON = "cc-mon"  # Claude + session monitor + task monitor
+    FULL_MONITOR = "full-monitor"  # Main + session + task + activity
+    DASHBOARD = "dashboard"  # Large activity dashboard with session stats
+    RALPH = "ralph"  # Shell + ralph monitor side-by-side
+    RALPH_FULL = "ralph-full"  # Shell + ralph monitor + task monitor
+    GIT_MON = "git-mon"  # Claude + git monitor
+
+
+class ConfigPreset(StrEnum):
+    """Predefined configuration presets."""
+
+    DEFAULT = "default"
+    MINIMAL = "minimal"
+    VERBOSE = "verbose"
+    DEBUG = "debug"
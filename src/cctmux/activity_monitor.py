@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import json
+import re
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date, datetime
+from functools import cache, cached_property, lru_cache
+from operator import attrgetter
 from pathlib import Path
 from typing import Any
 
@@ -14,6 +17,15 @@ from rich.table import Table
 from rich.text import Text
 
 
+def _json_int(data: dict[str, Any], key: str) -> int:
+    """Read an integer field, treating missing and null values as 0."""
+    value = data.get(key)
+    # json.loads already yields ints; only coerce the odd float or string
+    if type(value) is int:
+        return value
+    return int(value) if value is not None else 0
+
+
 def _empty_dict() -> dict[str, int]:
     return {}
 
@@ -26,7 +38,7 @@ def _empty_str_dict() -> dict[str, Any]:
     return {}
 
 
-@dataclass
+@dataclass(slots=True)
 class DailyActivity:
     """Activity data for a single day."""
 
@@ -37,17 +49,26 @@ class DailyActivity:
     tokens_by_model: dict[str, int] = field(default_factory=_empty_dict)
 
     @classmethod
-    def from_json(cls, data: dict[str, Any]) -> DailyActivity:
-        """Create DailyActivity from JSON data."""
+    def from_json(cls, data: dict[str, Any], tokens_by_model: dict[str, int] | None = None) -> DailyActivity:
+        """Create DailyActivity from JSON data.
+
+        Args:
+            data: A ``dailyActivity`` entry from stats-cache.json.
+            tokens_by_model: The day's ``tokensByModel`` mapping, if known.
+
+        Returns:
+            The parsed DailyActivity.
+        """
         return cls(
             date=str(data.get("date", "")),
-            message_count=int(data.get("messageCount", 0)),
-            session_count=int(data.get("sessionCount", 0)),
-            tool_call_count=int(data.get("toolCallCount", 0)),
+            message_count=_json_int(data, "messageCount"),
+            session_count=_json_int(data, "sessionCount"),
+            tool_call_count=_json_int(data, "toolCallCount"),
+            tokens_by_model=tokens_by_model if tokens_by_model is not None else {},
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelUsage:
     """Token usage data for a model."""
 
@@ -63,11 +84,11 @@ class ModelUsage:
         """Create ModelUsage from JSON data."""
         return cls(
             model_name=model_name,
-            input_tokens=int(data.get("inputTokens", 0)),
-            output_tokens=int(data.get("outputTokens", 0)),
-            cache_read_tokens=int(data.get("cacheReadInputTokens", 0)),
-            cache_creation_tokens=int(data.get("cacheCreationInputTokens", 0)),
-            web_search_requests=int(data.get("webSearchRequests", 0)),
+            input_tokens=_json_int(data, "inputTokens"),
+            output_tokens=_json_int(data, "outputTokens"),
+            cache_read_tokens=_json_int(data, "cacheReadInputTokens"),
+            cache_creation_tokens=_json_int(data, "cacheCreationInputTokens"),
+            web_search_requests=_json_int(data, "webSearchRequests"),
         )
 
     @property
@@ -82,35 +103,51 @@ class ModelUsage:
         Extracts model family and version from full model ID.
         e.g., 'claude-opus-4-6-20260205' -> 'opus-4.6'
              'claude-sonnet-4-20250514' -> 'sonnet-4'
+
+        Memoized per model name by _short_model_name, so the slotted
+        instance needs no per-object cache.
         """
-        import re
-
-        model_lower = self.model_name.lower()
-        # Match model family and version numbers (e.g., opus-4-6 or sonnet-4-5)
-        # Only match 1-2 digit versions to avoid matching dates (8 digits)
-        for family in ("opus", "sonnet", "haiku"):
-            if family in model_lower:
-                # Try to extract version like "4-6" or "4-5" or "3-5"
-                # Minor version must be 1-2 digits followed by dash or end
-                version_match = re.search(rf"{family}-?(\d)-(\d{{1,2}})(?:-|$)", model_lower)
-                if version_match:
-                    major = version_match.group(1)
-                    minor = version_match.group(2)
-                    return f"{family}-{major}.{minor}"
-                # Try major version only
-                version_match = re.search(rf"{family}-?(\d)(?:-|$)", model_lower)
-                if version_match:
-                    major = version_match.group(1)
-                    return f"{family}-{major}"
-                return family
-        if "glm" in model_lower:
-            return "glm"
-        return self.model_name[:15]
+        return _short_model_name(self.model_name)
+
+
+# (family, major-minor pattern, major-only pattern) for model_short.
+# Minor version must be 1-2 digits followed by dash or end, so 8-digit dates never match.
+_MODEL_SHORT_PATTERNS: tuple[tuple[str, re.Pattern[str], re.Pattern[str]], ...] = tuple(
+    (family, re.compile(rf"{family}-?(\d)-(\d{{1,2}})(?:-|$)"), re.compile(rf"{family}-?(\d)(?:-|$)"))
+    for family in ("opus", "sonnet", "haiku")
+)
+
+
+@cache
+def _short_model_name(model_name: str) -> str:
+    """Shorten a full model ID for display; see ModelUsage.model_short."""
+    model_lower = model_name.lower()
+    for family, version_re, major_re in _MODEL_SHORT_PATTERNS:
+        if family in model_lower:
+            # Try to extract version like "4-6" or "4-5" or "3-5"
+            version_match = version_re.search(model_lower)
+            if version_match:
+                major = version_match.group(1)
+                minor = version_match.group(2)
+                return f"{family}-{major}.{minor}"
+            # Try major version only
+            version_match = major_re.search(model_lower)
+            if version_match:
+                major = version_match.group(1)
+                return f"{family}-{major}"
+            return family
+    if "glm" in model_lower:
+        return "glm"
+    return model_name[:15]
 
 
 @dataclass
 class ActivityStats:
-    """Aggregated activity statistics."""
+    """Aggregated activity statistics.
+
+    Treat instances as read-only once loaded: derived values are cached on first
+    access and never recomputed, and load_stats_cache hands out shared instances.
+    """
 
     total_sessions: int = 0
     total_messages: int = 0
@@ -121,26 +158,59 @@ class ActivityStats:
     hour_counts: dict[str, int] = field(default_factory=_empty_dict)
     longest_session: dict[str, Any] = field(default_factory=_empty_str_dict)
 
-    @property
+    @cached_property
     def total_tokens(self) -> int:
-        """Total tokens across all models."""
+        """Total tokens across all models, computed on first access."""
         return sum(m.total_tokens for m in self.model_usage.values())
 
+    @cached_property
+    def total_cost(self) -> float:
+        """Estimated cost across all models, computed on first access."""
+        return sum(estimate_cost(m) for m in self.model_usage.values())
+
+    @cached_property
+    def sorted_model_usage(self) -> list[ModelUsage]:
+        """Model usage ordered by model name, built on first access."""
+        return [usage for _name, usage in sorted(self.model_usage.items())]
+
+    @cached_property
+    def hourly_counts(self) -> tuple[int, ...]:
+        """Counts for hours 0-23 in order, built once from ``hour_counts``."""
+        return tuple(self.hour_counts.get(str(hour), 0) for hour in range(24))
+
+    @cached_property
+    def max_hour_count(self) -> int:
+        """Largest value in ``hour_counts``, at least 1 so it can scale bars."""
+        return max(self.hour_counts.values(), default=0) or 1
+
+    @cached_property
+    def first_session_label(self) -> str:
+        """First session date as YYYY-MM-DD, or "" if missing or unparseable."""
+        if not self.first_session_date:
+            return ""
+        try:
+            first_date = datetime.fromisoformat(self.first_session_date.replace("Z", "+00:00"))
+        except ValueError:
+            return ""
+        return first_date.strftime("%Y-%m-%d")
+
     @property
     def days_tracked(self) -> int:
         """Number of days with activity data."""
         return len(self.daily_activity)
 
+    @cached_property
+    def sorted_daily_activity(self) -> list[DailyActivity]:
+        """Daily activity ordered newest first, sorted on first access."""
+        return sorted(self.daily_activity, key=attrgetter("date"), reverse=True)
+
     def get_recent_activity(self, days: int = 7) -> list[DailyActivity]:
         """Get activity for the last N days."""
-        if not self.daily_activity:
-            return []
-        # Sort by date descending
-        sorted_activity = sorted(self.daily_activity, key=lambda x: x.date, reverse=True)
-        return sorted_activity[:days]
+        return self.sorted_daily_activity[:days]
 
-    def get_weekly_summary(self) -> dict[str, int]:
-        """Get activity summary for the last 7 days."""
+    @cached_property
+    def weekly_summary(self) -> dict[str, int]:
+        """Totals for the last 7 days, computed on first access."""
         recent = self.get_recent_activity(7)
         return {
             "messages": sum(a.message_count for a in recent),
@@ -148,6 +218,10 @@ class ActivityStats:
             "tool_calls": sum(a.tool_call_count for a in recent),
         }
 
+    def get_weekly_summary(self) -> dict[str, int]:
+        """Get activity summary for the last 7 days."""
+        return self.weekly_summary
+
 
 # Model pricing per 1M tokens
 MODEL_PRICING: dict[str, dict[str, float]] = {
@@ -172,8 +246,9 @@ MODEL_PRICING: dict[str, dict[str, float]] = {
 }
 
 
+@cache
 def _get_model_tier(model: str) -> str:
-    """Determine pricing tier from model name."""
+    """Determine pricing tier from model name; memoized per raw name."""
     model_lower = model.lower()
     if "opus" in model_lower:
         return "opus"
@@ -193,46 +268,86 @@ def estimate_cost(model_usage: ModelUsage) -> float:
     Returns:
         Estimated cost in USD.
     """
-    tier = _get_model_tier(model_usage.model_name)
+    return _estimate_cost(
+        model_usage.model_name,
+        model_usage.input_tokens,
+        model_usage.output_tokens,
+        model_usage.cache_read_tokens,
+        model_usage.cache_creation_tokens,
+    )
+
+
+@lru_cache(maxsize=512)
+def _estimate_cost(
+    model_name: str,
+    input_tokens: int,
+    output_tokens: int,
+    cache_read_tokens: int,
+    cache_creation_tokens: int,
+) -> float:
+    """Compute estimate_cost from the raw counts; memoized across refreshes."""
+    tier = _get_model_tier(model_name)
     if tier not in MODEL_PRICING:
         return 0.0
 
     pricing = MODEL_PRICING[tier]
     cost = (
-        (model_usage.input_tokens / 1_000_000) * pricing["input"]
-        + (model_usage.output_tokens / 1_000_000) * pricing["output"]
-        + (model_usage.cache_read_tokens / 1_000_000) * pricing["cache_read"]
-        + (model_usage.cache_creation_tokens / 1_000_000) * pricing["cache_write"]
+        (input_tokens / 1_000_000) * pricing["input"]
+        + (output_tokens / 1_000_000) * pricing["output"]
+        + (cache_read_tokens / 1_000_000) * pricing["cache_read"]
+        + (cache_creation_tokens / 1_000_000) * pricing["cache_write"]
     )
     return round(cost, 2)
 
 
+# stats file path -> ((mtime_ns, size), parsed stats)
+_stats_cache: dict[Path, tuple[tuple[int, int], ActivityStats]] = {}
+
+
+def clear_stats_cache() -> None:
+    """Drop all memoized load_stats_cache results."""
+    _stats_cache.clear()
+
+
 def load_stats_cache() -> ActivityStats | None:
     """Load activity stats from Claude Code's stats-cache.json.
 
+    The parsed result is reused while the file's mtime and size are
+    unchanged, so repeated refreshes cost a single ``stat()``. Treat the
+    returned stats as read-only.
+
     Returns:
         ActivityStats object or None if file doesn't exist.
     """
     stats_file = Path.home() / ".claude" / "stats-cache.json"
-    if not stats_file.exists():
+    try:
+        st = stats_file.stat()
+    except OSError:
         return None
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _stats_cache.get(stats_file)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
 
     try:
-        with stats_file.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-    except (json.JSONDecodeError, OSError):
+        # One bulk read; json.loads detects the UTF encoding of bytes itself
+        data = json.loads(stats_file.read_bytes())
+    except (json.JSONDecodeError, UnicodeDecodeError, OSError):
         return None
 
-    # Parse daily activity
-    daily_activity: list[DailyActivity] = []
-    for item in data.get("dailyActivity", []):
-        daily_activity.append(DailyActivity.from_json(item))
+    stats = _parse_stats(data)
+    _stats_cache[stats_file] = (signature, stats)
+    return stats
+
 
-    # Merge daily token data
+def _parse_stats(data: dict[str, Any]) -> ActivityStats:
+    """Build ActivityStats from the decoded stats-cache.json document."""
+    # Parse daily activity with each day's token data merged in
     daily_tokens = {d.get("date"): d.get("tokensByModel", {}) for d in data.get("dailyModelTokens", [])}
-    for activity in daily_activity:
-        if activity.date in daily_tokens:
-            activity.tokens_by_model = daily_tokens[activity.date]
+    daily_activity = [
+        DailyActivity.from_json(item, daily_tokens.get(str(item.get("date", ""))))
+        for item in data.get("dailyActivity", [])
+    ]
 
     # Parse model usage
     model_usage: dict[str, ModelUsage] = {}
@@ -245,8 +360,8 @@ def load_stats_cache() -> ActivityStats | None:
         hour_counts[hour_str] = int(count)
 
     return ActivityStats(
-        total_sessions=int(data.get("totalSessions", 0)),
-        total_messages=int(data.get("totalMessages", 0)),
+        total_sessions=_json_int(data, "totalSessions"),
+        total_messages=_json_int(data, "totalMessages"),
         first_session_date=str(data.get("firstSessionDate", "")),
         last_computed_date=str(data.get("lastComputedDate", "")),
         daily_activity=daily_activity,
@@ -256,17 +371,43 @@ def load_stats_cache() -> ActivityStats | None:
     )
 
 
+# (threshold, suffix) pairs for _format_tokens, largest first
+_TOKEN_SUFFIXES: tuple[tuple[int, str], ...] = ((1_000_000_000, "B"), (1_000_000, "M"), (1_000, "K"))
+
+
+@lru_cache(maxsize=1024)
 def _format_tokens(count: int) -> str:
     """Format token count for display."""
-    if count >= 1_000_000_000:
-        return f"{count / 1_000_000_000:.1f}B"
-    if count >= 1_000_000:
-        return f"{count / 1_000_000:.1f}M"
-    if count >= 1_000:
-        return f"{count / 1_000:.1f}K"
+    for threshold, suffix in _TOKEN_SUFFIXES:
+        if count >= threshold:
+            return f"{count / threshold:.1f}{suffix}"
     return str(count)
 
 
+# (10-cell bar with trailing space, style) for each heatmap intensity 0-4
+_HEATMAP_BARS: tuple[tuple[str, str], ...] = tuple(
+    (f"{block * 10} ", color)
+    for block, color in zip(" ░▒▓█", ("dim", "green", "yellow", "orange1", "red"), strict=True)
+)
+
+
+_WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+@lru_cache(maxsize=512)
+def _short_date_label(date_str: str) -> str:
+    """Format an ISO date as a "Mon 05 " heatmap label, falling back to its tail."""
+    try:
+        day = date.fromisoformat(date_str)
+    except ValueError:
+        # Full timestamps are rare here; datetime is a date subclass
+        try:
+            day = datetime.fromisoformat(date_str)
+        except ValueError:
+            return f"{date_str[-5:]} "
+    return f"{_WEEKDAYS[day.weekday()]} {day.day:02d} "
+
+
 def build_ascii_heatmap(stats: ActivityStats, days: int = 14) -> Text:
     """Build an ASCII heatmap of activity.
 
@@ -284,35 +425,23 @@ def build_ascii_heatmap(stats: ActivityStats, days: int = 14) -> Text:
         text.append("No activity data available", style="dim")
         return text
 
-    # Find max for scaling
-    max_messages = max(a.message_count for a in recent) if recent else 1
-    if max_messages == 0:
-        max_messages = 1
-
-    # Blocks for intensity
-    blocks = " ░▒▓█"
+    # Find max for scaling (C-level map instead of a generator frame)
+    max_messages = max(map(attrgetter("message_count"), recent)) or 1
 
     # Reverse to show oldest first
-    recent_sorted = list(reversed(recent))
-
-    for activity in recent_sorted:
-        # Calculate intensity (0-4)
-        intensity = min(4, int((activity.message_count / max_messages) * 4))
-        block = blocks[intensity]
-
-        # Parse date for display
-        try:
-            date_obj = datetime.fromisoformat(activity.date)
-            day_str = date_obj.strftime("%a %d")
-        except ValueError:
-            day_str = activity.date[-5:]
-
-        color = ["dim", "green", "yellow", "orange1", "red"][intensity]
-        text.append(f"{day_str} ", style="dim")
-        text.append(f"{block * 10} ", style=color)
-        text.append(f"{activity.message_count:>5} msgs", style="dim")
-        text.append(f"  {activity.session_count:>2} sessions", style="dim")
-        text.append(f"  {activity.tool_call_count:>4} tools\n", style="dim")
+    for activity in reversed(recent):
+        # Calculate intensity (0-4) in integer math; max_messages is never zero
+        intensity = min(4, max(0, activity.message_count * 4 // max_messages))
+        bar, color = _HEATMAP_BARS[intensity]
+
+        text.append(_short_date_label(activity.date), style="dim")
+        text.append(bar, style=color)
+        # One span for the trailing counts, which share a style
+        text.append(
+            f"{activity.message_count:>5} msgs  {activity.session_count:>2} sessions  "
+            f"{activity.tool_call_count:>4} tools\n",
+            style="dim",
+        )
 
     return text
 
@@ -342,38 +471,37 @@ def build_model_usage_table(
     if show_cost:
         table.add_column("Est. Cost", width=10)
 
-    sorted_models = sorted(stats.model_usage.items())
+    sorted_models = stats.sorted_model_usage
     display_models = sorted_models[:max_models] if max_models > 0 else sorted_models
 
-    for _model_name, usage in display_models:
-        row: list[str | Text] = [
+    rows: list[list[str | Text]] = [
+        [
             Text(usage.model_short, style="cyan"),
-            _format_tokens(usage.input_tokens),
-            _format_tokens(usage.output_tokens),
-            _format_tokens(usage.cache_read_tokens),
-            _format_tokens(usage.cache_creation_tokens),
+            *map(
+                _format_tokens,
+                (usage.input_tokens, usage.output_tokens, usage.cache_read_tokens, usage.cache_creation_tokens),
+            ),
+            *((Text(f"${estimate_cost(usage):.2f}", style="yellow"),) if show_cost else ()),
         ]
-        if show_cost:
-            cost = estimate_cost(usage)
-            row.append(Text(f"${cost:.2f}", style="yellow"))
-        table.add_row(*row)
+        for usage in display_models
+    ]
 
     hidden = len(sorted_models) - len(display_models)
     if hidden > 0:
-        truncation_row: list[str | Text] = [
-            Text(f"... and {hidden} more models", style="dim italic"),
-            "",
-            "",
-            "",
-            "",
-        ]
-        if show_cost:
-            truncation_row.append("")
-        table.add_row(*truncation_row)
+        # Blank out every column after the label
+        rows.append([Text(f"... and {hidden} more models", style="dim italic"), *[""] * (len(table.columns) - 1)])
+
+    for row in rows:
+        table.add_row(*row)
 
     return table
 
 
+# "HH:00 " label for each hour, plus padded bars for 0-20 cells
+_HOUR_LABELS: tuple[str, ...] = tuple(f"{hour:02d}:00 " for hour in range(24))
+_HOUR_BARS: tuple[str, ...] = tuple(f"{'█' * n:<20} " for n in range(21))
+
+
 def build_hour_distribution(stats: ActivityStats) -> Text:
     """Build ASCII visualization of hourly activity distribution.
 
@@ -389,20 +517,15 @@ def build_hour_distribution(stats: ActivityStats) -> Text:
         text.append("No hourly data available", style="dim")
         return text
 
-    max_count = max(stats.hour_counts.values()) if stats.hour_counts else 1
-    if max_count == 0:
-        max_count = 1
+    max_count = stats.max_hour_count
 
     # Show distribution as bar chart
-    for hour in range(24):
-        hour_str = str(hour)
-        count = stats.hour_counts.get(hour_str, 0)
-        bar_len = int((count / max_count) * 20) if max_count > 0 else 0
-
-        hour_display = f"{hour:02d}:00"
-        bar = "█" * bar_len
-        text.append(f"{hour_display} ", style="dim")
-        text.append(f"{bar:<20} ", style="cyan")
+    for hour_label, count in zip(_HOUR_LABELS, stats.hourly_counts, strict=True):
+        # Integer scaling; max_count is never zero
+        bar_len = min(20, max(0, count * 20 // max_count))
+
+        text.append(hour_label, style="dim")
+        text.append(_HOUR_BARS[bar_len], style="cyan")
         text.append(f"{count}\n", style="dim")
 
     return text
@@ -431,9 +554,10 @@ def build_summary_panel(stats: ActivityStats, show_cost: bool = True) -> Panel:
     # Weekly summary
     weekly = stats.get_weekly_summary()
     text.append("Last 7 Days: ", style="dim")
-    text.append(f"{weekly['messages']:,} msgs  ", style="green")
-    text.append(f"{weekly['sessions']} sessions  ", style="green")
-    text.append(f"{weekly['tool_calls']:,} tool calls\n", style="green")
+    text.append(
+        f"{weekly['messages']:,} msgs  {weekly['sessions']} sessions  {weekly['tool_calls']:,} tool calls\n",
+        style="green",
+    )
 
     # Token totals
     text.append("Total Tokens: ", style="dim")
@@ -441,22 +565,81 @@ def build_summary_panel(stats: ActivityStats, show_cost: bool = True) -> Panel:
 
     # Cost estimates
     if show_cost:
-        total_cost = sum(estimate_cost(m) for m in stats.model_usage.values())
         text.append("  Est. Total Cost: ", style="dim")
-        text.append(f"${total_cost:,.2f}", style="bold yellow")
+        text.append(f"${stats.total_cost:,.2f}", style="bold yellow")
 
     # First session
-    if stats.first_session_date:
-        try:
-            first_date = datetime.fromisoformat(stats.first_session_date.replace("Z", "+00:00"))
-            text.append("\nFirst Session: ", style="dim")
-            text.append(first_date.strftime("%Y-%m-%d"), style="dim cyan")
-        except ValueError:
-            pass
+    if stats.first_session_label:
+        text.append("\nFirst Session: ", style="dim")
+        text.append(stats.first_session_label, style="dim cyan")
 
     return Panel(text, title="Activity Summary", border_style="blue")
 
 
+@lru_cache(maxsize=32)
+def _allocate_panel_rows(
+    terminal_height: int,
+    days: int,
+    days_available: int,
+    model_count: int,
+    show_heatmap: bool,
+    show_model_usage: bool,
+    show_hour_distribution: bool,
+) -> tuple[int, int]:
+    """Split the terminal height between the heatmap and model usage panels.
+
+    Pure function of its arguments, so repeated refreshes at the same
+    terminal size reuse the previous allocation.
+
+    Args:
+        terminal_height: Terminal height available to the dashboard.
+        days: Requested number of heatmap days.
+        days_available: Number of days with activity data.
+        model_count: Number of models with usage data.
+        show_heatmap: Whether the heatmap panel is shown.
+        show_model_usage: Whether the model usage panel is shown.
+        show_hour_distribution: Whether the hourly distribution panel is shown.
+
+    Returns:
+        Tuple of (heatmap days, max models); max models of 0 means unlimited.
+    """
+    effective_days = days
+    effective_max_models = 0  # 0 = unlimited
+
+    # Summary panel: ~6 content lines + 2 borders = 8
+    summary_height = 8
+    # Hourly distribution: 24 content lines + 2 borders = 26 (if shown)
+    hourly_height = 26 if show_hour_distribution else 0
+    available = terminal_height - summary_height - hourly_height
+
+    # Variable panels: heatmap and model usage
+    heatmap_overhead = 2  # panel borders
+    model_overhead = 3  # panel borders + table header
+
+    natural_heatmap = max(min(days, days_available), 1) if show_heatmap else 0
+    natural_models = max(model_count, 1) if show_model_usage else 0
+
+    if show_heatmap and show_model_usage:
+        total_natural = natural_heatmap + natural_models
+        content_budget = max(2, available - heatmap_overhead - model_overhead)
+        if content_budget >= total_natural:
+            effective_days = natural_heatmap
+            effective_max_models = natural_models
+        else:
+            heat_share = max(1, round(content_budget * natural_heatmap / total_natural))
+            model_share = max(1, content_budget - heat_share)
+            effective_days = min(heat_share, natural_heatmap)
+            effective_max_models = min(model_share, natural_models)
+    elif show_heatmap:
+        content_budget = max(1, available - heatmap_overhead)
+        effective_days = min(natural_heatmap, content_budget)
+    elif show_model_usage:
+        content_budget = max(1, available - model_overhead)
+        effective_max_models = min(natural_models, content_budget)
+
+    return effective_days, effective_max_models
+
+
 def build_display(
     stats: ActivityStats,
     days: int = 14,
@@ -486,41 +669,15 @@ def build_display(
     effective_max_models = 0  # 0 = unlimited
 
     if terminal_height > 0:
-        # Summary panel: ~6 content lines + 2 borders = 8
-        summary_height = 8
-        # Hourly distribution: 24 content lines + 2 borders = 26 (if shown)
-        hourly_height = 26 if show_hour_distribution else 0
-        available = terminal_height - summary_height - hourly_height
-
-        # Variable panels: heatmap and model usage
-        heatmap_overhead = 2  # panel borders
-        model_overhead = 3  # panel borders + table header
-
-        show_heat = show_heatmap
-        show_models = show_model_usage
-
-        natural_heatmap = min(days, len(stats.daily_activity)) if show_heat else 0
-        natural_heatmap = max(natural_heatmap, 1) if show_heat else 0
-        natural_models = len(stats.model_usage) if show_models else 0
-        natural_models = max(natural_models, 1) if show_models else 0
-
-        if show_heat and show_models:
-            total_natural = natural_heatmap + natural_models
-            content_budget = max(2, available - heatmap_overhead - model_overhead)
-            if content_budget >= total_natural:
-                effective_days = natural_heatmap
-                effective_max_models = natural_models
-            else:
-                heat_share = max(1, round(content_budget * natural_heatmap / total_natural))
-                model_share = max(1, content_budget - heat_share)
-                effective_days = min(heat_share, natural_heatmap)
-                effective_max_models = min(model_share, natural_models)
-        elif show_heat:
-            content_budget = max(1, available - heatmap_overhead)
-            effective_days = min(natural_heatmap, content_budget)
-        elif show_models:
-            content_budget = max(1, available - model_overhead)
-            effective_max_models = min(natural_models, content_budget)
+        effective_days, effective_max_models = _allocate_panel_rows(
+            terminal_height,
+            days,
+            len(stats.daily_activity),
+            len(stats.model_usage),
+            show_heatmap,
+            show_model_usage,
+            show_hour_distribution,
+        )
 
     components: list[Panel | Table] = [
         build_summary_panel(stats, show_cost),
@@ -1,41 +1,45 @@
 """Configuration management for cctmux."""
 
+import copy
+import re
+import tempfile
 from dataclasses import dataclass, field
 from enum import StrEnum
+from functools import cache
 from pathlib import Path
-from typing import cast
+from typing import IO, TYPE_CHECKING, cast
 
-import yaml
 from pydantic import BaseModel, ValidationError
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
 
+from cctmux._cli_enums import ConfigPreset, LayoutType
 from cctmux.xdg_paths import get_config_file_path
 
+if TYPE_CHECKING:
+    import yaml
+    from rich.console import Console
 
-class LayoutType(StrEnum):
-    """Available tmux layout types."""
 
-    DEFAULT = "default"  # No initial split
-    EDITOR = "editor"  # 70/30 horizontal split
-    MONITOR = "monitor"  # Main + bottom bar (80/20)
-    TRIPLE = "triple"  # Main + 2 side panes
-    CC_MON = "cc-mon"  # Claude + session monitor + task monitor
-    FULL_MONITOR = "full-monitor"  # Main + session + task + activity
-    DASHBOARD = "dashboard"  # Large activity dashboard with session stats
-    RALPH = "ralph"  # Shell + ralph monitor side-by-side
-    RALPH_FULL = "ralph-full"  # Shell + ralph monitor + task monitor
-    GIT_MON = "git-mon"  # Claude + git monitor
+# yaml and rich are imported on first use so that modules needing only the
+# models (layouts, tmux_manager, the monitors' presets) skip their import cost.
+@cache
+def yaml_loader() -> "type[yaml.CSafeLoader | yaml.SafeLoader]":
+    """Return the libyaml-backed safe loader when available; also used by the CLI's layout commands."""
+    import yaml
 
+    return yaml.CSafeLoader if yaml.__with_libyaml__ else yaml.SafeLoader
 
-class ConfigPreset(StrEnum):
-    """Predefined configuration presets."""
 
-    DEFAULT = "default"
-    MINIMAL = "minimal"
-    VERBOSE = "verbose"
-    DEBUG = "debug"
+@cache
+def yaml_dumper() -> "type[yaml.CSafeDumper | yaml.SafeDumper]":
+    """Return the libyaml-backed safe dumper when available; also used by the CLI's layout commands."""
+    import yaml
+
+    return yaml.CSafeDumper if yaml.__with_libyaml__ else yaml.SafeDumper
+
+
+BUILTIN_LAYOUT_NAMES: frozenset[str] = frozenset(lt.value for lt in LayoutType)
+
+_LAYOUT_NAME_RE = re.compile(r"^[a-z0-9]([a-z0-9-]*[a-z0-9])?$")
 
 
 class SessionMonitorConfig(BaseModel):
@@ -141,19 +145,16 @@ def validate_layout_name(name: str) -> str:
     Raises:
         ValueError: If the name is invalid or collides with a built-in layout.
     """
-    import re
-
     if not name:
         raise ValueError("Layout name cannot be empty")
 
-    if not re.match(r"^[a-z0-9]([a-z0-9-]*[a-z0-9])?$", name):
+    if not _LAYOUT_NAME_RE.match(name):
         raise ValueError(
             f"Layout name '{name}' must be lowercase alphanumeric with hyphens, no leading/trailing hyphens"
         )
 
     # Check collision with built-in layouts
-    builtin_values = {lt.value for lt in LayoutType}
-    if name in builtin_values:
+    if name in BUILTIN_LAYOUT_NAMES:
         raise ValueError(f"Layout name '{name}' conflicts with built-in layout")
 
     return name
@@ -195,7 +196,7 @@ class TeamConfig(BaseModel):
     agents: list[TeamAgent]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ConfigWarning:
     """A config validation warning."""
 
@@ -244,45 +245,94 @@ class Config(BaseModel):
     # Team configuration
     team: TeamConfig | None = None
 
+    @property
+    def custom_layouts_by_name(self) -> dict[str, CustomLayout]:
+        """Custom layouts keyed by name, rebuilt from ``custom_layouts`` on each access."""
+        return {cl.name: cl for cl in self.custom_layouts}
+
 
-def _deep_merge(base: dict[str, object], override: dict[str, object]) -> dict[str, object]:
-    """Recursively merge override dict into base dict.
+def _deep_merge_into(base: dict[str, object], override: dict[str, object]) -> None:
+    """Merge override dict into base dict in place.
 
     For nested dicts, merges recursively. For all other types, override wins.
+    Nested levels are walked with an explicit stack, and only dicts present on
+    both sides are descended into; nothing is copied. Values taken from
+    ``override`` are shared with ``base``, so callers pass freshly loaded dicts.
 
     Args:
-        base: The base dictionary.
+        base: The dictionary to update.
         override: The dictionary with overriding values.
-
-    Returns:
-        A new merged dictionary.
     """
-    result = dict(base)
-    for key, value in override.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = _deep_merge(result[key], value)  # type: ignore[arg-type]
-        else:
-            result[key] = value
-    return result
+    stack = [(base, override)]
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            current = target.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                stack.append((cast(dict[str, object], current), cast(dict[str, object], value)))
+            else:
+                target[key] = value
+
+
+# load_config results keyed by (config file paths, strict). Each entry also
+# records the (mtime_ns, size) of every file so edits invalidate it on lookup.
+_ConfigCacheKey = tuple[tuple[str, ...], bool]
+_ConfigCacheEntry = tuple[tuple[tuple[int, int] | None, ...], Config, list[ConfigWarning]]
+_config_cache: dict[_ConfigCacheKey, _ConfigCacheEntry] = {}
+
+# Parsed YAML per file, tagged with the (mtime_ns, size) it was read at
+_yaml_cache: dict[Path, tuple[tuple[int, int], dict[str, object]]] = {}
+
+
+def _stat_signature(path: Path) -> tuple[int, int] | None:
+    """Return (mtime_ns, size) for a file, or None if it cannot be stat'ed."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
 
+def clear_config_cache() -> None:
+    """Drop all memoized load_config results and parsed YAML files."""
+    _config_cache.clear()
+    _yaml_cache.clear()
 
-def _load_yaml_file(path: Path) -> tuple[dict[str, object], list[ConfigWarning]]:
+
+def _load_yaml_file(
+    path: Path, signature: tuple[int, int] | None = None
+) -> tuple[dict[str, object], list[ConfigWarning]]:
     """Load a YAML file and return its contents as a dict with warnings.
 
+    Successful parses are memoized by path and reused while the file's mtime
+    and size are unchanged. Each call returns a deep copy of the cached dict.
+
     Args:
         path: Path to the YAML file.
+        signature: The file's (mtime_ns, size) if the caller already stat'ed it.
 
     Returns:
         Tuple of (parsed dict, list of warnings). Empty dict on missing/invalid.
     """
-    if not path.exists():
-        return {}, []
-    try:
-        with path.open(encoding="utf-8") as f:
-            raw = yaml.safe_load(f)
-        if not isinstance(raw, dict):
+    if signature is None:
+        signature = _stat_signature(path)
+        if signature is None:
             return {}, []
-        return cast(dict[str, object], raw), []
+    cached = _yaml_cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return copy.deepcopy(cached[1]), []
+
+    import yaml
+
+    try:
+        # Bytes go straight to libyaml, which detects the encoding itself
+        raw = yaml.load(path.read_bytes(), Loader=yaml_loader())
+        data = cast(dict[str, object], raw) if isinstance(raw, dict) else {}
+        _yaml_cache[path] = (signature, data)
+        return copy.deepcopy(data), []
+    except FileNotFoundError:
+        # Removed between the stat and the open; same as never existing
+        return {}, []
     except yaml.YAMLError as e:
         return {}, [
             ConfigWarning(
@@ -318,6 +368,10 @@ def load_config(
     If a project config sets ``ignore_parent_configs: true``, the user config is
     skipped and only project configs are used.
 
+    Results are memoized per set of config files and invalidated when any of
+    them changes mtime or size. Each call returns a fresh copy, so callers may
+    mutate the returned Config.
+
     Args:
         config_path: Optional path to user config file. Uses default if None.
         project_dir: Optional project directory containing .cctmux.yaml files.
@@ -326,38 +380,71 @@ def load_config(
     Returns:
         Tuple of (loaded Config, list of ConfigWarnings).
     """
+    user_config_path = config_path or get_config_file_path()
+    paths = [user_config_path]
+    if project_dir:
+        paths += [project_dir / ".cctmux.yaml", project_dir / ".cctmux.yaml.local"]
+
+    key: _ConfigCacheKey = (tuple(str(p) for p in paths), strict)
+    signatures = tuple(_stat_signature(p) for p in paths)
+    cached = _config_cache.get(key)
+    if cached is None or cached[0] != signatures:
+        config, warnings = _load_config_uncached(paths, signatures, strict)
+        cached = (signatures, config, warnings)
+        _config_cache[key] = cached
+
+    return cached[1].model_copy(deep=True), list(cached[2])
+
+
+def _load_config_uncached(
+    paths: list[Path],
+    signatures: tuple[tuple[int, int] | None, ...],
+    strict: bool,
+) -> tuple[Config, list[ConfigWarning]]:
+    """Read, merge, and validate the config layers (see load_config).
+
+    ``paths`` holds the user config, followed by the project and local configs
+    when a project directory was given. ``signatures`` holds their stat results,
+    so files that were missing at lookup time are not touched again.
+    """
     warnings: list[ConfigWarning] = []
 
-    user_config_path = config_path or get_config_file_path()
-    user_config, user_warnings = _load_yaml_file(user_config_path)
-    warnings.extend(user_warnings)
+    layers: list[dict[str, object]] = []
+    for path, signature in zip(paths, signatures, strict=True):
+        data, layer_warnings = _load_yaml_file(path, signature) if signature is not None else ({}, [])
+        layers.append(data)
+        warnings.extend(layer_warnings)
 
-    if project_dir:
-        project_config, proj_warnings = _load_yaml_file(project_dir / ".cctmux.yaml")
-        warnings.extend(proj_warnings)
-        local_config, local_warnings = _load_yaml_file(project_dir / ".cctmux.yaml.local")
-        warnings.extend(local_warnings)
+    user_config, *project_layers = layers
+    if project_layers:
+        project_config, local_config = project_layers
 
         # Check if any project config wants to ignore parent configs
         ignore_parent = project_config.get("ignore_parent_configs", False) or local_config.get(
             "ignore_parent_configs", False
         )
 
+        # Each layer is a fresh copy from _load_yaml_file, so merge in place
         if ignore_parent:
             # Start from defaults, apply only project configs
-            merged: dict[str, object] = _deep_merge(project_config, local_config)
+            merged = project_config
         else:
             # Normal layered merge: user → project → local
-            merged = _deep_merge(user_config, project_config)
-            merged = _deep_merge(merged, local_config)
+            merged = user_config
+            _deep_merge_into(merged, project_config)
+        _deep_merge_into(merged, local_config)
     else:
         merged = user_config
 
     try:
         return Config.model_validate(merged), warnings
     except (ValueError, ValidationError) as e:
+        # Top-level keys that failed validation, removed for partial recovery
+        bad_keys: set[str] = set()
         if isinstance(e, ValidationError):
             for error in e.errors():
+                if error["loc"]:
+                    bad_keys.add(str(error["loc"][0]))
                 field_path = ".".join(str(loc) for loc in error["loc"])
                 warnings.append(
                     ConfigWarning(
@@ -377,22 +464,16 @@ def load_config(
                 )
             )
 
-        if strict:
+        if strict or not bad_keys:
             return Config(), warnings
 
-        # Attempt partial recovery: remove bad fields and retry
-        if isinstance(e, ValidationError):
-            for error in e.errors():
-                # Remove the top-level key that caused the error
-                if error["loc"]:
-                    top_key = str(error["loc"][0])
-                    merged.pop(top_key, None)
-            try:
-                return Config.model_validate(merged), warnings
-            except (ValueError, ValidationError):
-                pass
-
-        return Config(), warnings
+        # Attempt partial recovery: remove every bad field, then retry once
+        for key in bad_keys:
+            merged.pop(key, None)
+        try:
+            return Config.model_validate(merged), warnings
+        except (ValueError, ValidationError):
+            return Config(), warnings
 
 
 def load_team_config(path: Path) -> TeamConfig:
@@ -411,12 +492,14 @@ def load_team_config(path: Path) -> TeamConfig:
         FileNotFoundError: If the file does not exist.
         ValueError: If the YAML is invalid or fails validation.
     """
+    import yaml
+
     if not path.exists():
         raise FileNotFoundError(f"Team config file not found: {path}")
 
     try:
         with path.open(encoding="utf-8") as f:
-            raw = yaml.safe_load(f)
+            raw = yaml.load(f, Loader=yaml_loader())
     except yaml.YAMLError as e:
         raise ValueError(f"Invalid YAML in {path}: {e}") from e
 
@@ -432,7 +515,7 @@ def load_team_config(path: Path) -> TeamConfig:
         raise ValueError(f"Team config validation failed: {e}") from e
 
 
-def display_config_warnings(warnings: list[ConfigWarning], console: Console) -> None:
+def display_config_warnings(warnings: list[ConfigWarning], console: "Console") -> None:
     """Display config warnings using Rich formatting.
 
     Args:
@@ -442,12 +525,14 @@ def display_config_warnings(warnings: list[ConfigWarning], console: Console) ->
     if not warnings:
         return
 
+    from rich.panel import Panel
+    from rich.text import Text
+
     text = Text()
     for i, warning in enumerate(warnings):
         if i > 0:
             text.append("\n")
-        text.append(f"  {warning.file}", style="dim")
-        text.append(": ", style="dim")
+        text.append(f"  {warning.file}: ", style="dim")
         text.append(warning.field_name, style="bold")
         text.append(f" — {warning.message}", style="yellow")
         if warning.value is not None:
@@ -457,7 +542,10 @@ def display_config_warnings(warnings: list[ConfigWarning], console: Console) ->
 
 
 def save_config(config: Config, config_path: Path | None = None) -> None:
-    """Save configuration to YAML file.
+    """Atomically save configuration to YAML file.
+
+    The YAML is written to a temp file next to the target and renamed over
+    it, so readers never see a partially written config.
 
     Args:
         config: The configuration to save.
@@ -466,17 +554,37 @@ def save_config(config: Config, config_path: Path | None = None) -> None:
     path = config_path or get_config_file_path()
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    data = config.model_dump()
-    # Convert enum to string value
-    data["default_layout"] = config.default_layout.value
+    tmp_fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    try:
+        with open(tmp_fd, "w", encoding="utf-8") as f:
+            dump_config_yaml(config, f)
+        Path(tmp_path).replace(path)
+    except OSError:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+    clear_config_cache()
 
-    with path.open("w", encoding="utf-8") as f:
-        yaml.dump(data, f, default_flow_style=False)
 
+def dump_config_yaml(config: Config, stream: IO[str]) -> None:
+    """Write a configuration as YAML, e.g. for ``--dump-config``.
 
+    Args:
+        config: The configuration to render.
+        stream: Text stream the block-style YAML is written to.
+    """
+    import yaml
+
+    yaml.dump(config.model_dump(mode="json"), stream, Dumper=yaml_dumper(), default_flow_style=False)
+
+
+@cache
 def get_preset_config(preset: ConfigPreset) -> Config:
     """Get a preset configuration.
 
+    Presets never change, so each one is built once per process and the same
+    instance is returned on later calls; treat it as read-only.
+
     Args:
         preset: The preset type.
 
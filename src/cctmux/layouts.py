@@ -3,6 +3,7 @@
 import math
 import subprocess
 from collections.abc import Callable
+from functools import cache
 
 from cctmux.config import CustomLayout, LayoutType, PaneSplit, SplitDirection, TeamLayoutType
 
@@ -911,6 +912,20 @@ BUILTIN_TEMPLATES: dict[LayoutType, list[PaneSplit]] = {
     ],
 }
 
+
+@cache
+def dumped_template(layout: LayoutType) -> tuple[dict[str, object], ...]:
+    """Return the ``exclude_defaults`` dump of a built-in template.
+
+    Args:
+        layout: The built-in layout to dump.
+
+    Returns:
+        One dict per split, shared between calls and not to be mutated.
+    """
+    return tuple(s.model_dump(mode="json", exclude_defaults=True) for s in BUILTIN_TEMPLATES.get(layout, ()))
+
+
 # Layout descriptions for list command
 LAYOUT_DESCRIPTIONS: dict[LayoutType, str] = {
     LayoutType.DEFAULT: "No initial split, panes created on demand",
@@ -925,6 +940,11 @@ LAYOUT_DESCRIPTIONS: dict[LayoutType, str] = {
     LayoutType.GIT_MON: "Claude + git monitor",
 }
 
+# (name, description) rows for the layout list command, in LayoutType order
+BUILTIN_LAYOUT_ROWS: tuple[tuple[str, str], ...] = tuple(
+    (lt.value, LAYOUT_DESCRIPTIONS.get(lt, "")) for lt in LayoutType
+)
+
 
 # Dictionary dispatch for layout handlers
 _LAYOUT_HANDLERS: dict[LayoutType, LayoutHandler] = {
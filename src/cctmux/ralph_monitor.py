@@ -159,14 +159,13 @@ def build_ralph_status_panel(state: RalphState) -> Panel:
     # Token/cost totals
     total_input = sum(it.get("input_tokens", 0) for it in state.iterations)
     total_output = sum(it.get("output_tokens", 0) for it in state.iterations)
-    total_cost = sum(it.get("cost_usd", 0.0) for it in state.iterations)
     total_tools = sum(it.get("tool_calls", 0) for it in state.iterations)
 
     text.append("\n")
     text.append("Tokens: ", style="dim")
     text.append(f"{_format_tokens(total_input)} in / {_format_tokens(total_output)} out", style="bold")
     text.append("  Cost: ", style="dim")
-    text.append(f"${total_cost:.2f}", style="bold yellow")
+    text.append(f"${state.total_cost_usd:.2f}", style="bold yellow")
     text.append("  Tools: ", style="dim")
     text.append(str(total_tools), style="bold cyan")
 
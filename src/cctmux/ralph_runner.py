@@ -17,7 +17,7 @@ from enum import StrEnum
 from pathlib import Path
 from typing import Any, cast
 
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from rich.console import Console
 
 err_console = Console(stderr=True)
@@ -116,6 +116,27 @@ class RalphState(BaseModel):
     tasks_completed: int = 0
     child_pid: int | None = None
     iterations: list[dict[str, Any]] = []
+    total_cost_usd: float = 0.0
+
+    @model_validator(mode="after")
+    def _backfill_total_cost(self) -> RalphState:
+        """Derive the running cost total when it was not supplied.
+
+        State files written before the total was persisted only carry
+        per-iteration costs, so sum them once on load.
+        """
+        if "total_cost_usd" not in self.model_fields_set:
+            self.total_cost_usd = sum(it.get("cost_usd", 0.0) for it in self.iterations)
+        return self
+
+    def record_iteration(self, iteration: dict[str, Any]) -> None:
+        """Append an iteration result and add its cost to the running total.
+
+        Args:
+            iteration: Serialized iteration result (see IterationResult.to_dict).
+        """
+        self.iterations.append(iteration)
+        self.total_cost_usd += iteration.get("cost_usd", 0.0)
 
 
 # Regex for markdown checklist items
@@ -351,11 +372,13 @@ def load_ralph_state(project_path: Path) -> RalphState | None:
         RalphState if file exists and is valid, None otherwise.
     """
     state_file = project_path / ".claude" / "ralph-state.json"
-    if not state_file.exists():
+    try:
+        content = state_file.read_bytes()
+    except FileNotFoundError:
         return None
 
+    # pydantic-core parses the raw bytes directly, no str decode needed
     try:
-        content = state_file.read_text(encoding="utf-8")
         return RalphState.model_validate_json(content)
     except (json.JSONDecodeError, ValueError):
         return None
@@ -803,7 +826,7 @@ def run_ralph_loop(
             )
 
             # Update state
-            state.iterations.append(iter_result.to_dict())
+            state.record_iteration(iter_result.to_dict())
             state.tasks_total = tasks_after.total
             state.tasks_completed = tasks_after.completed
 
@@ -854,12 +877,11 @@ def run_ralph_loop(
         signal.signal(signal.SIGINT, old_handler)
 
     # Print summary
-    total_cost = sum(it.get("cost_usd", 0.0) for it in state.iterations)
     total_tokens_in = sum(it.get("input_tokens", 0) for it in state.iterations)
     total_tokens_out = sum(it.get("output_tokens", 0) for it in state.iterations)
     console.print(
         f"\n[bold]Ralph Loop finished:[/] {state.status}  "
         f"Iterations: {len(state.iterations)}  "
-        f"Cost: ${total_cost:.2f}  "
+        f"Cost: ${state.total_cost_usd:.2f}  "
         f"Tokens: {total_tokens_in}→{total_tokens_out}"
     )
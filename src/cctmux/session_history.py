@@ -7,6 +7,7 @@ from pathlib import Path
 import yaml
 from pydantic import BaseModel, model_validator
 
+from cctmux.config import yaml_dumper, yaml_loader
 from cctmux.xdg_paths import ensure_directories, get_history_file_path
 
 
@@ -54,7 +55,7 @@ def load_history(history_path: Path | None = None) -> SessionHistory:
 
     try:
         with path.open(encoding="utf-8") as f:
-            data: dict[str, object] = yaml.safe_load(f) or {}
+            data: dict[str, object] = yaml.load(f, Loader=yaml_loader()) or {}
         return SessionHistory.model_validate(data)
     except (yaml.YAMLError, ValueError):
         return SessionHistory()
@@ -77,7 +78,7 @@ def save_history(history: SessionHistory, history_path: Path | None = None) -> N
     tmp_fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
     try:
         with open(tmp_fd, "w", encoding="utf-8") as f:
-            yaml.dump(data, f, default_flow_style=False)
+            yaml.dump(data, f, Dumper=yaml_dumper(), default_flow_style=False)
         Path(tmp_path).replace(path)
     except OSError:
         Path(tmp_path).unlink(missing_ok=True)
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import heapq
 import json
+import os
 import re
 import shutil
 import time
 from collections import Counter
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -1356,6 +1359,49 @@ class IncrementalEventReader:
         return self._events
 
 
+def _iter_jsonl_files(folder: Path) -> Iterator[os.DirEntry[str]]:
+    """Yield the ``*.jsonl`` file entries directly inside a folder.
+
+    Args:
+        folder: Directory to scan.
+
+    Yields:
+        Directory entries for JSONL files; nothing if the folder is unreadable.
+    """
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.name.endswith(".jsonl"):
+                    yield entry
+    except OSError:
+        return
+
+
+def _iter_recent_session_files(claude_projects: Path) -> Iterator[tuple[float, int, str, str]]:
+    """Yield every session JSONL file across all Claude projects.
+
+    Args:
+        claude_projects: The ``~/.claude/projects`` directory.
+
+    Yields:
+        Tuples of (mtime, size in bytes, file stem, short project name).
+    """
+    try:
+        with os.scandir(claude_projects) as it:
+            project_folders = [entry for entry in it if entry.is_dir()]
+    except OSError:
+        return
+    for project_folder in project_folders:
+        name = project_folder.name
+        project_name = name.split("-")[-1] if "-" in name else name
+        for entry in _iter_jsonl_files(Path(project_folder.path)):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            yield st.st_mtime, st.st_size, entry.name.removesuffix(".jsonl"), project_name
+
+
 def list_sessions(project_path: Path | None = None) -> None:
     """List available session JSONL files.
 
@@ -1378,14 +1424,18 @@ def list_sessions(project_path: Path | None = None) -> None:
 
         console.print(f"[bold]Sessions for: {project_path}[/]\n")
         encoded = encode_project_path(project_path)
-        project_folder = claude_projects / encoded
+        project_files = list(_iter_jsonl_files(claude_projects / encoded))
 
         for session in sessions[:10]:  # Limit to 10
             # Find matching JSONL
-            for jsonl_file in project_folder.glob("*.jsonl"):
-                if session.session_id in jsonl_file.stem:
-                    size_kb = jsonl_file.stat().st_size / 1024
-                    console.print(f"  [cyan]{jsonl_file.stem[:12]}...[/]")
+            for entry in project_files:
+                stem = entry.name.removesuffix(".jsonl")
+                if session.session_id in stem:
+                    try:
+                        size_kb = entry.stat().st_size / 1024
+                    except OSError:
+                        break
+                    console.print(f"  [cyan]{stem[:12]}...[/]")
                     console.print(f"    Summary: {session.summary[:50]}")
                     console.print(f"    Modified: {session.modified.strftime('%Y-%m-%d %H:%M')}")
                     console.print(f"    Size: {size_kb:.1f} KB")
@@ -1395,28 +1445,13 @@ def list_sessions(project_path: Path | None = None) -> None:
         # Show all recent sessions
         console.print("[bold]Recent Claude Code sessions:[/]\n")
 
-        all_sessions: list[tuple[Path, float, str]] = []
-        for project_folder in claude_projects.iterdir():
-            if not project_folder.is_dir():
-                continue
-            project_name = project_folder.name.split("-")[-1] if "-" in project_folder.name else project_folder.name
-            for jsonl_file in project_folder.glob("*.jsonl"):
-                try:
-                    mtime = jsonl_file.stat().st_mtime
-                    all_sessions.append((jsonl_file, mtime, project_name))
-                except OSError:
-                    continue
-
-        # Sort by mtime, most recent first
-        all_sessions.sort(key=lambda x: x[1], reverse=True)
-
-        for jsonl_file, mtime, project_name in all_sessions[:15]:
-            size_kb = jsonl_file.stat().st_size / 1024
-            from datetime import datetime as dt
-
-            mod_time = dt.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M")
-            console.print(f"  [cyan]{jsonl_file.stem[:12]}...[/] ({project_name})")
-            console.print(f"    Modified: {mod_time}  Size: {size_kb:.1f} KB")
+        # Keep only the 15 most recent while scanning instead of sorting every file
+        for mtime, size, stem, project_name in heapq.nlargest(
+            15, _iter_recent_session_files(claude_projects), key=lambda x: x[0]
+        ):
+            mod_time = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M")
+            console.print(f"  [cyan]{stem[:12]}...[/] ({project_name})")
+            console.print(f"    Modified: {mod_time}  Size: {size / 1024:.1f} KB")
 
 
 def _find_most_recent_jsonl(project_folder: Path) -> tuple[Path, float] | None:
@@ -1107,6 +1107,22 @@ def build_display(
     return Group(*components)
 
 
+def _count_task_files(task_dir: Path) -> int:
+    """Count the task JSON files in a task folder without building a list.
+
+    Args:
+        task_dir: The task folder to scan.
+
+    Returns:
+        Number of ``*.json`` files, or 0 if the folder cannot be read.
+    """
+    try:
+        with os.scandir(task_dir) as it:
+            return sum(1 for entry in it if entry.name.endswith(".json"))
+    except OSError:
+        return 0
+
+
 def list_sessions(project_path: Path | None = None) -> None:
     """List available task sessions.
 
@@ -1129,7 +1145,7 @@ def list_sessions(project_path: Path | None = None) -> None:
         if sessions:
             console.print(f"[bold]Sessions for project: {project_path}[/]\n")
             for session in sessions:
-                task_count = len(list(session.task_path.glob("*.json"))) if session.task_path else 0
+                task_count = _count_task_files(session.task_path) if session.task_path else 0
                 console.print(f"  [cyan]{session.session_id[:12]}...[/]")
                 console.print(f"    Summary: {session.summary[:50]}")
                 console.print(f"    Modified: {session.modified.strftime('%Y-%m-%d %H:%M')}")
@@ -1142,7 +1158,7 @@ def list_sessions(project_path: Path | None = None) -> None:
         if other_folders:
             console.print("[bold]Other task folders (custom names):[/]\n")
             for name, path in other_folders:
-                task_count = len(list(path.glob("*.json")))
+                task_count = _count_task_files(path)
                 console.print(f"  [cyan]{name}[/] ({task_count} tasks)")
     else:
         # Show all sessions with tasks
@@ -1153,7 +1169,7 @@ def list_sessions(project_path: Path | None = None) -> None:
 
         console.print("[bold]Available task sessions:[/]\n")
         for name, path in sessions:
-            task_count = len(list(path.glob("*.json")))
+            task_count = _count_task_files(path)
             console.print(f"  [cyan]{name}[/] ({task_count} tasks)")
 
 
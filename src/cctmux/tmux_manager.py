@@ -12,7 +12,7 @@ from cctmux.layouts import apply_custom_layout, apply_layout, compute_team_layou
 
 def is_inside_tmux() -> bool:
     """Check if we're running inside a tmux session."""
-    return os.environ.get("TMUX") is not None
+    return "TMUX" in os.environ
 
 
 def session_exists(session_name: str) -> bool:
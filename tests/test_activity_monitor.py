@@ -0,0 +1,375 @@
+"""Tests for activity_monitor module."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import pytest
+
+from rich.text import Text
+
+from cctmux.activity_monitor import (
+    ActivityStats,
+    DailyActivity,
+    ModelUsage,
+    _allocate_panel_rows,
+    _format_tokens,
+    _get_model_tier,
+    build_ascii_heatmap,
+    build_hour_distribution,
+    build_model_usage_table,
+    build_summary_panel,
+    clear_stats_cache,
+    estimate_cost,
+    load_stats_cache,
+)
+
+
+def _write_stats(home: Path, data: dict[str, Any] | bytes) -> None:
+    """Write a stats-cache.json under a fake home directory."""
+    claude_dir = home / ".claude"
+    claude_dir.mkdir(parents=True, exist_ok=True)
+    payload = data if isinstance(data, bytes) else json.dumps(data).encode("utf-8")
+    (claude_dir / "stats-cache.json").write_bytes(payload)
+
+
+class TestLoadStatsCache:
+    """Tests for load_stats_cache function."""
+
+    def test_missing_file(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a missing stats cache returns None."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        assert load_stats_cache() is None
+
+    def test_corrupted_file(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that invalid JSON or encoding returns None."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        _write_stats(tmp_path, b"not json {{{")
+        assert load_stats_cache() is None
+        _write_stats(tmp_path, b'{"totalSessions": "\xff"}')
+        assert load_stats_cache() is None
+
+    def test_reuses_parse_until_file_changes(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that an unchanged file is served from cache and a rewrite is reparsed."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        clear_stats_cache()
+        _write_stats(tmp_path, {"totalSessions": 1})
+
+        first = load_stats_cache()
+        assert first is not None
+        assert load_stats_cache() is first
+
+        _write_stats(tmp_path, {"totalSessions": 22})
+        second = load_stats_cache()
+        assert second is not None
+        assert second.total_sessions == 22
+
+    def test_null_counts_default_to_zero(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that null numeric fields are read as zero instead of failing."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        _write_stats(
+            tmp_path,
+            {
+                "totalSessions": None,
+                "dailyActivity": [{"date": "2026-01-01", "messageCount": None}],
+                "modelUsage": {"claude-opus-4-6": {"inputTokens": None, "outputTokens": 7}},
+            },
+        )
+
+        stats = load_stats_cache()
+
+        assert stats is not None
+        assert stats.total_sessions == 0
+        assert stats.daily_activity[0].message_count == 0
+        assert stats.model_usage["claude-opus-4-6"].total_tokens == 7
+
+    def test_non_int_counts_coerced(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that float and string counts are still converted to int."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        _write_stats(tmp_path, {"totalSessions": 3.0, "totalMessages": "12"})
+
+        stats = load_stats_cache()
+
+        assert stats is not None
+        assert stats.total_sessions == 3
+        assert type(stats.total_sessions) is int
+        assert stats.total_messages == 12
+
+    def test_parses_stats(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that stats are parsed and daily tokens merged by date."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        _write_stats(
+            tmp_path,
+            {
+                "totalSessions": 3,
+                "totalMessages": 42,
+                "firstSessionDate": "2026-01-01T00:00:00Z",
+                "dailyActivity": [
+                    {"date": "2026-01-01", "messageCount": 10, "sessionCount": 1, "toolCallCount": 4},
+                    {"date": "2026-01-02", "messageCount": 32, "sessionCount": 2, "toolCallCount": 9},
+                ],
+                "dailyModelTokens": [{"date": "2026-01-02", "tokensByModel": {"claude-opus-4-6": 500}}],
+                "modelUsage": {"claude-opus-4-6": {"inputTokens": 100, "outputTokens": 50}},
+                "hourCounts": {"9": 5, "14": 7},
+            },
+        )
+
+        stats = load_stats_cache()
+
+        assert stats is not None
+        assert stats.total_sessions == 3
+        assert stats.total_messages == 42
+        assert [a.date for a in stats.daily_activity] == ["2026-01-01", "2026-01-02"]
+        assert stats.daily_activity[0].tokens_by_model == {}
+        assert stats.daily_activity[1].tokens_by_model == {"claude-opus-4-6": 500}
+        assert stats.model_usage["claude-opus-4-6"].total_tokens == 150
+        assert stats.hour_counts == {"9": 5, "14": 7}
+
+
+class TestModelShort:
+    """Tests for ModelUsage.model_short."""
+
+    def test_family_and_versions(self) -> None:
+        """Test family/version extraction without matching date suffixes."""
+        assert ModelUsage("claude-opus-4-6-20260205").model_short == "opus-4.6"
+        assert ModelUsage("claude-sonnet-4-20250514").model_short == "sonnet-4"
+        assert ModelUsage("claude-3-5-haiku-20241022").model_short == "haiku"
+        assert ModelUsage("Claude-Haiku-4-5").model_short == "haiku-4.5"
+
+    def test_unknown_models(self) -> None:
+        """Test fallbacks for non-Claude model names."""
+        assert ModelUsage("glm-4.6").model_short == "glm"
+        assert ModelUsage("some-very-long-model-name").model_short == "some-very-long-"
+
+
+class TestEstimateCost:
+    """Tests for estimate_cost function."""
+
+    def test_model_tier(self) -> None:
+        """Test tier detection is case-insensitive and defaults to opus."""
+        assert _get_model_tier("claude-Sonnet-4-5") == "sonnet"
+        assert _get_model_tier("claude-haiku-4-5") == "haiku"
+        assert _get_model_tier("glm-4.6") == "opus"
+
+    def test_prices_by_tier(self) -> None:
+        """Test per-million pricing for each token kind."""
+        usage = ModelUsage(
+            "claude-sonnet-4-5",
+            input_tokens=1_000_000,
+            output_tokens=1_000_000,
+            cache_read_tokens=1_000_000,
+            cache_creation_tokens=1_000_000,
+        )
+        assert estimate_cost(usage) == 22.05
+
+    def test_reflects_updated_counts(self) -> None:
+        """Test that changed counts are not served from a stale cached cost."""
+        usage = ModelUsage("claude-haiku-4-5", output_tokens=1_000_000)
+        assert estimate_cost(usage) == 4.0
+        usage.output_tokens = 2_000_000
+        assert estimate_cost(usage) == 8.0
+
+
+class TestActivityStats:
+    """Tests for ActivityStats aggregation helpers."""
+
+    def _stats(self) -> ActivityStats:
+        """Build stats with five days of activity in unsorted order."""
+        dates = ["2026-01-03", "2026-01-01", "2026-01-09", "2026-01-05", "2026-01-02"]
+        return ActivityStats(
+            daily_activity=[
+                DailyActivity(date=d, message_count=i + 1, session_count=1, tool_call_count=10)
+                for i, d in enumerate(dates)
+            ]
+        )
+
+    def test_recent_activity_newest_first(self) -> None:
+        """Test that recent activity returns the newest N days in descending order."""
+        recent = self._stats().get_recent_activity(3)
+        assert [a.date for a in recent] == ["2026-01-09", "2026-01-05", "2026-01-03"]
+
+    def test_sorted_daily_activity_computed_once(self) -> None:
+        """Test that the newest-first view is sorted once and left out of repr and eq."""
+        stats = self._stats()
+        first = stats.sorted_daily_activity
+        assert stats.sorted_daily_activity is first
+        assert [a.date for a in first] == ["2026-01-09", "2026-01-05", "2026-01-03", "2026-01-02", "2026-01-01"]
+        assert "sorted_daily_activity" not in repr(stats)
+        assert stats == self._stats()
+
+    def test_recent_activity_empty(self) -> None:
+        """Test that no history or zero days yields an empty list."""
+        assert ActivityStats().get_recent_activity(7) == []
+        assert self._stats().get_recent_activity(0) == []
+
+    def test_recent_activity_negative_days_slices(self) -> None:
+        """Test that a negative count keeps plain slice semantics (all but the oldest N)."""
+        recent = self._stats().get_recent_activity(-2)
+        assert [a.date for a in recent] == ["2026-01-09", "2026-01-05", "2026-01-03"]
+
+    def test_hourly_counts(self) -> None:
+        """Test that hour_counts is expanded to 24 ordered counts."""
+        hourly = ActivityStats(hour_counts={"0": 2, "23": 5, "24": 9}).hourly_counts
+        assert len(hourly) == 24
+        assert (hourly[0], hourly[1], hourly[23]) == (2, 0, 5)
+
+    def test_max_hour_count(self) -> None:
+        """Test the hourly maximum is never below 1."""
+        assert ActivityStats(hour_counts={"3": 4, "9": 11}).max_hour_count == 11
+        assert ActivityStats(hour_counts={"3": 0}).max_hour_count == 1
+        assert ActivityStats().max_hour_count == 1
+
+    def test_first_session_label(self) -> None:
+        """Test first session formatting and the unparseable fallback."""
+        assert ActivityStats(first_session_date="2026-01-02T03:04:05.678Z").first_session_label == "2026-01-02"
+        assert ActivityStats(first_session_date="yesterday").first_session_label == ""
+        assert ActivityStats().first_session_label == ""
+
+    def test_weekly_summary(self) -> None:
+        """Test that the weekly summary totals the most recent days."""
+        assert self._stats().get_weekly_summary() == {"messages": 15, "sessions": 5, "tool_calls": 50}
+
+    def test_weekly_summary_computed_once(self) -> None:
+        """Test that the summary is computed on first access and then reused."""
+        stats = self._stats()
+        first = stats.get_weekly_summary()
+        assert stats.get_weekly_summary() is first
+        assert stats.weekly_summary is first
+
+    def test_totals_across_models(self) -> None:
+        """Test token and cost totals summed over all models."""
+        stats = ActivityStats(
+            model_usage={
+                "claude-opus-4-6": ModelUsage("claude-opus-4-6", input_tokens=1_000_000, output_tokens=10),
+                "claude-haiku-4-5": ModelUsage("claude-haiku-4-5", output_tokens=1_000_000),
+            }
+        )
+        assert stats.total_tokens == 2_000_010
+        assert stats.total_cost == 19.0
+
+
+class TestBuildHourDistribution:
+    """Tests for build_hour_distribution function."""
+
+    def test_bars_scaled_to_busiest_hour(self) -> None:
+        """Test that every hour is listed with bars scaled to 20 cells."""
+        stats = ActivityStats(hour_counts={"0": 3, "9": 10, "23": 1})
+        lines = build_hour_distribution(stats).plain.splitlines()
+        assert len(lines) == 24
+        assert lines[0] == f"00:00 {'█' * 6:<20} 3"
+        assert lines[9] == f"09:00 {'█' * 20} 10"
+        assert lines[12] == f"12:00 {'':<20} 0"
+
+    def test_no_data(self) -> None:
+        """Test the placeholder when there are no hourly counts."""
+        assert build_hour_distribution(ActivityStats()).plain == "No hourly data available"
+
+
+class TestBuildAsciiHeatmap:
+    """Tests for build_ascii_heatmap function."""
+
+    def test_rows_oldest_first(self) -> None:
+        """Test row labels, intensity blocks and ordering."""
+        stats = ActivityStats(
+            daily_activity=[
+                DailyActivity(date="2026-01-06", message_count=8, session_count=2, tool_call_count=5),
+                DailyActivity(date="2026-01-05", message_count=2, session_count=1, tool_call_count=0),
+                DailyActivity(date="2026-01-01", message_count=1),
+            ]
+        )
+        lines = build_ascii_heatmap(stats, days=2).plain.splitlines()
+        assert lines == [
+            f"Mon 05 {'░' * 10}     2 msgs   1 sessions     0 tools",
+            f"Tue 06 {'█' * 10}     8 msgs   2 sessions     5 tools",
+        ]
+
+    def test_timestamp_dates_still_labelled(self) -> None:
+        """Test that full ISO timestamps get a weekday label too."""
+        stats = ActivityStats(daily_activity=[DailyActivity(date="2026-01-07T10:30:00")])
+        assert build_ascii_heatmap(stats).plain.startswith("Wed 07 ")
+
+    def test_unparseable_date_uses_tail(self) -> None:
+        """Test that non-ISO dates fall back to their last five characters."""
+        stats = ActivityStats(daily_activity=[DailyActivity(date="bad-date-xx")])
+        assert build_ascii_heatmap(stats).plain.startswith("te-xx " + " " * 10)
+
+
+class TestAllocatePanelRows:
+    """Tests for _allocate_panel_rows layout math."""
+
+    def test_everything_fits(self) -> None:
+        """Test that natural sizes are used when the terminal is tall enough."""
+        assert _allocate_panel_rows(60, 14, 10, 3, True, True, False) == (10, 3)
+
+    def test_split_when_short(self) -> None:
+        """Test proportional sharing of a tight budget between both panels."""
+        # available = 20 - 8 = 12, budget = 12 - 2 - 3 = 7 for 14 + 7 natural rows
+        assert _allocate_panel_rows(20, 14, 30, 7, True, True, False) == (5, 2)
+
+    def test_single_panel_budget(self) -> None:
+        """Test that a lone panel is capped by the remaining height."""
+        assert _allocate_panel_rows(40, 14, 30, 5, True, False, True) == (4, 0)
+        assert _allocate_panel_rows(40, 14, 30, 5, False, True, False) == (14, 5)
+
+
+class TestFormatTokens:
+    """Tests for _format_tokens function."""
+
+    def test_suffixes(self) -> None:
+        """Test each magnitude boundary."""
+        assert _format_tokens(999) == "999"
+        assert _format_tokens(1_000) == "1.0K"
+        assert _format_tokens(2_500_000) == "2.5M"
+        assert _format_tokens(3_200_000_000) == "3.2B"
+
+
+class TestBuildSummaryPanel:
+    """Tests for build_summary_panel function."""
+
+    def test_summary_lines(self) -> None:
+        """Test the totals, weekly and first-session lines."""
+        stats = ActivityStats(
+            total_sessions=4,
+            total_messages=1234,
+            first_session_date="2026-01-02T03:04:05Z",
+            daily_activity=[
+                DailyActivity(date="2026-01-02", message_count=1200, session_count=3, tool_call_count=1500)
+            ],
+        )
+        renderable = build_summary_panel(stats, show_cost=False).renderable
+        assert isinstance(renderable, Text)
+        assert renderable.plain.splitlines() == [
+            "Total Sessions: 4  Total Messages: 1,234  Days Tracked: 1",
+            "Last 7 Days: 1,200 msgs  3 sessions  1,500 tool calls",
+            "Total Tokens: 0",
+            "First Session: 2026-01-02",
+        ]
+
+
+class TestBuildModelUsageTable:
+    """Tests for build_model_usage_table function."""
+
+    def _stats(self) -> ActivityStats:
+        """Build stats with three models."""
+        names = ("claude-haiku-4-5", "claude-opus-4-6", "claude-sonnet-4-5")
+        return ActivityStats(model_usage={n: ModelUsage(n, input_tokens=1_500, output_tokens=2_000_000) for n in names})
+
+    def test_rows_with_cost(self) -> None:
+        """Test one row per model with formatted counts and a cost column."""
+        table = build_model_usage_table(self._stats())
+        assert len(table.columns) == 6
+        assert table.row_count == 3
+        assert list(table.columns[0].cells)[0].plain == "haiku-4.5"
+        assert list(table.columns[1].cells) == ["1.5K", "1.5K", "1.5K"]
+        assert [c.plain for c in table.columns[5].cells] == ["$8.00", "$150.02", "$30.00"]
+
+    def test_truncation_row(self) -> None:
+        """Test that hidden models are summarized in a blank-padded row."""
+        table = build_model_usage_table(self._stats(), show_cost=False, max_models=1)
+        assert len(table.columns) == 5
+        assert table.row_count == 2
+        assert list(table.columns[0].cells)[1].plain == "... and 2 more models"
+        assert list(table.columns[4].cells)[1] == ""
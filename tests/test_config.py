@@ -1,5 +1,6 @@
 """Tests for cctmux.config module."""
 
+import io
 import tempfile
 from pathlib import Path
 
@@ -8,18 +9,23 @@ import yaml
 
 from cctmux.config import (
     Config,
+    ConfigPreset,
     ConfigWarning,
     CustomLayout,
     GitMonitorConfig,
     LayoutType,
     PaneSplit,
     SplitDirection,
-    _deep_merge,
+    _deep_merge_into,
     _load_yaml_file,
     display_config_warnings,
+    dump_config_yaml,
+    get_preset_config,
     load_config,
     save_config,
     validate_layout_name,
+    yaml_dumper,
+    yaml_loader,
 )
 
 
@@ -69,6 +75,24 @@ class TestConfig:
         assert Config(pi_session_prefix="my-").pi_session_prefix == "my-"
         assert Config(pi_session_prefix="").pi_session_prefix == ""
 
+    def test_custom_layouts_by_name(self) -> None:
+        """custom_layouts_by_name should index custom layouts without affecting dumps."""
+        side = CustomLayout(name="side")
+        config = Config(custom_layouts=[side, CustomLayout(name="stack")])
+        assert config.custom_layouts_by_name["side"] is side
+        assert set(config.custom_layouts_by_name) == {"side", "stack"}
+        assert "custom_layouts_by_name" not in config.model_dump()
+
+    def test_custom_layouts_by_name_follows_list(self) -> None:
+        """custom_layouts_by_name should reflect later edits to custom_layouts and copies."""
+        config = Config(custom_layouts=[CustomLayout(name="side")])
+        assert "extra" not in config.custom_layouts_by_name
+        config.custom_layouts.append(CustomLayout(name="extra"))
+        assert "extra" in config.custom_layouts_by_name
+        copied = config.model_copy(deep=True)
+        copied.custom_layouts.pop()
+        assert set(copied.custom_layouts_by_name) == {"side"}
+
 
 class TestLayoutType:
     """Tests for LayoutType enum."""
@@ -81,56 +105,63 @@ class TestLayoutType:
         assert LayoutType.TRIPLE.value == "triple"
 
 
-class TestDeepMerge:
-    """Tests for _deep_merge function."""
+class TestDeepMergeInto:
+    """Tests for _deep_merge_into function."""
 
     def test_flat_merge(self) -> None:
         """Should merge flat dicts with override winning."""
         base: dict[str, object] = {"a": 1, "b": 2}
         override: dict[str, object] = {"b": 3, "c": 4}
-        result = _deep_merge(base, override)
-        assert result == {"a": 1, "b": 3, "c": 4}
+        _deep_merge_into(base, override)
+        assert base == {"a": 1, "b": 3, "c": 4}
 
     def test_nested_merge(self) -> None:
         """Should recursively merge nested dicts."""
         base: dict[str, object] = {"git_monitor": {"show_log": True, "max_commits": 10}}
         override: dict[str, object] = {"git_monitor": {"max_commits": 20}}
-        result = _deep_merge(base, override)
-        assert result == {"git_monitor": {"show_log": True, "max_commits": 20}}
+        _deep_merge_into(base, override)
+        assert base == {"git_monitor": {"show_log": True, "max_commits": 20}}
 
     def test_override_replaces_non_dict(self) -> None:
         """Should replace non-dict values entirely."""
         base: dict[str, object] = {"a": [1, 2, 3]}
         override: dict[str, object] = {"a": [4, 5]}
-        result = _deep_merge(base, override)
-        assert result == {"a": [4, 5]}
+        _deep_merge_into(base, override)
+        assert base == {"a": [4, 5]}
+
+    def test_dict_replaces_scalar(self) -> None:
+        """Should replace a scalar with a dict and vice versa."""
+        base: dict[str, object] = {"a": 1, "b": {"x": 1}}
+        override: dict[str, object] = {"a": {"y": 2}, "b": 3}
+        _deep_merge_into(base, override)
+        assert base == {"a": {"y": 2}, "b": 3}
 
     def test_empty_override(self) -> None:
-        """Should return base when override is empty."""
+        """Should leave base unchanged when override is empty."""
         base: dict[str, object] = {"a": 1, "b": 2}
-        result = _deep_merge(base, {})
-        assert result == {"a": 1, "b": 2}
+        _deep_merge_into(base, {})
+        assert base == {"a": 1, "b": 2}
 
     def test_empty_base(self) -> None:
-        """Should return override when base is empty."""
-        override: dict[str, object] = {"a": 1, "b": 2}
-        result = _deep_merge({}, override)
-        assert result == {"a": 1, "b": 2}
+        """Should copy override into an empty base."""
+        base: dict[str, object] = {}
+        _deep_merge_into(base, {"a": 1, "b": 2})
+        assert base == {"a": 1, "b": 2}
 
-    def test_does_not_mutate_inputs(self) -> None:
-        """Should not modify the input dicts."""
+    def test_does_not_mutate_override(self) -> None:
+        """Should only modify the base dict."""
         base: dict[str, object] = {"a": 1, "nested": {"x": 1}}
         override: dict[str, object] = {"nested": {"y": 2}}
-        _deep_merge(base, override)
-        assert base == {"a": 1, "nested": {"x": 1}}
+        _deep_merge_into(base, override)
+        assert base == {"a": 1, "nested": {"x": 1, "y": 2}}
         assert override == {"nested": {"y": 2}}
 
     def test_deeply_nested_merge(self) -> None:
         """Should handle multiple levels of nesting."""
         base: dict[str, object] = {"l1": {"l2": {"l3": {"a": 1, "b": 2}}}}
         override: dict[str, object] = {"l1": {"l2": {"l3": {"b": 3, "c": 4}}}}
-        result = _deep_merge(base, override)
-        assert result == {"l1": {"l2": {"l3": {"a": 1, "b": 3, "c": 4}}}}
+        _deep_merge_into(base, override)
+        assert base == {"l1": {"l2": {"l3": {"a": 1, "b": 3, "c": 4}}}}
 
 
 class TestLoadYamlFile:
@@ -179,6 +210,67 @@ class TestLoadYamlFile:
             assert data == {}
             assert warnings == []
 
+    def test_file_removed_after_stat(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A file deleted between the stat and the open should read as missing."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "test.yaml"
+            path.write_text(yaml.dump({"key": "value"}), encoding="utf-8")
+
+            def _raise(*_args: object, **_kwargs: object) -> None:
+                raise FileNotFoundError(path)
+
+            monkeypatch.setattr(Path, "read_bytes", _raise)
+            data, warnings = _load_yaml_file(path)
+            assert data == {}
+            assert warnings == []
+
+    def test_invalid_utf8_is_parse_warning(self) -> None:
+        """Undecodable bytes should be reported as a YAML error, not raised."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "test.yaml"
+            path.write_bytes(b"key: \xff\xfe\x00bad\n")
+            data, warnings = _load_yaml_file(path)
+            assert data == {}
+            assert len(warnings) == 1
+            assert "YAML parse error" in warnings[0].message
+
+    def test_given_signature_skips_stat(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A caller-supplied signature should be used instead of stat'ing again."""
+        import cctmux.config as config_module
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "test.yaml"
+            path.write_text(yaml.dump({"key": "value"}), encoding="utf-8")
+            st = path.stat()
+
+            def _fail(_path: Path) -> None:
+                raise AssertionError("unexpected stat")
+
+            monkeypatch.setattr(config_module, "_stat_signature", _fail)
+            data, _warnings = _load_yaml_file(path, (st.st_mtime_ns, st.st_size))
+            assert data == {"key": "value"}
+
+    def test_returns_independent_copies(self) -> None:
+        """Mutating a returned dict should not leak into the cached parse."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "test.yaml"
+            path.write_text(yaml.dump({"outer": {"inner": 1}}), encoding="utf-8")
+            first, _warnings = _load_yaml_file(path)
+            first["outer"]["inner"] = 2  # type: ignore[index]
+            first.pop("outer")
+            second, _warnings = _load_yaml_file(path)
+            assert second == {"outer": {"inner": 1}}
+
+    def test_file_change_invalidates(self) -> None:
+        """Editing the file should be picked up on the next load."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "test.yaml"
+            path.write_text(yaml.dump({"key": "value"}), encoding="utf-8")
+            _load_yaml_file(path)
+            path.write_text(yaml.dump({"key": "changed"}), encoding="utf-8")
+            data, _warnings = _load_yaml_file(path)
+            assert data == {"key": "changed"}
+
 
 class TestLoadConfig:
     """Tests for load_config function."""
@@ -243,6 +335,26 @@ class TestLoadConfig:
             # Should still get a usable config (partial recovery)
             assert isinstance(config, Config)
 
+    def test_recovery_drops_every_bad_key_and_keeps_the_rest(self) -> None:
+        """Partial recovery should remove all invalid keys in one pass."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.yaml"
+            config_path.write_text(
+                yaml.dump(
+                    {
+                        "max_history_entries": "not-a-number",
+                        "session_monitor": {"max_events": "many"},
+                        "status_bar_enabled": True,
+                    }
+                ),
+                encoding="utf-8",
+            )
+            config, warnings = load_config(config_path)
+            assert {w.field_name for w in warnings} == {"max_history_entries", "session_monitor.max_events"}
+            assert config.status_bar_enabled is True
+            assert config.max_history_entries == Config().max_history_entries
+            assert config.session_monitor == Config().session_monitor
+
     def test_strict_mode_no_recovery(self) -> None:
         """Strict mode should not attempt partial recovery."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -256,6 +368,60 @@ class TestLoadConfig:
             assert config == Config()  # defaults, no recovery
 
 
+class TestDumpConfigYaml:
+    """Tests for dump_config_yaml."""
+
+    def test_enums_render_as_plain_values(self) -> None:
+        """Enum fields should be emitted as their string values and round-trip."""
+        config = Config(
+            default_layout=LayoutType.EDITOR,
+            custom_layouts=[
+                CustomLayout(name="side", splits=[PaneSplit(direction=SplitDirection.HORIZONTAL, size=30)]),
+            ],
+        )
+        stream = io.StringIO()
+        dump_config_yaml(config, stream)
+        text = stream.getvalue()
+        assert "!!python" not in text
+        assert "default_layout: editor" in text
+        assert Config.model_validate(yaml.safe_load(text)) == config
+
+
+class TestLoadConfigCache:
+    """Tests for load_config memoization."""
+
+    def test_returns_independent_copies(self) -> None:
+        """Mutating a returned config should not leak into later loads."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.yaml"
+            config_path.write_text(yaml.dump({"max_history_entries": 25}), encoding="utf-8")
+            first, _warnings = load_config(config_path)
+            first.custom_layouts.append(CustomLayout(name="scratch"))
+            second, _warnings = load_config(config_path)
+            assert second.max_history_entries == 25
+            assert second.custom_layouts == []
+
+    def test_file_change_invalidates(self) -> None:
+        """Editing the file should be picked up on the next load."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.yaml"
+            config_path.write_text(yaml.dump({"max_history_entries": 25}), encoding="utf-8")
+            load_config(config_path)
+            config_path.write_text(yaml.dump({"max_history_entries": 125}), encoding="utf-8")
+            config, _warnings = load_config(config_path)
+            assert config.max_history_entries == 125
+
+    def test_save_config_invalidates(self) -> None:
+        """Saving through save_config should be visible immediately."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.yaml"
+            save_config(Config(max_history_entries=25), config_path)
+            load_config(config_path)
+            save_config(Config(max_history_entries=26), config_path)
+            config, _warnings = load_config(config_path)
+            assert config.max_history_entries == 26
+
+
 class TestLayeredConfig:
     """Tests for layered project configuration loading."""
 
@@ -481,6 +647,41 @@ class TestSaveConfig:
             save_config(config, config_path)
             assert config_path.exists()
 
+    def test_custom_layouts_round_trip(self, tmp_path: Path) -> None:
+        """Saved custom layouts should load back through the safe loader."""
+        config_path = tmp_path / "config.yaml"
+        layout = CustomLayout(name="side", splits=[PaneSplit(direction=SplitDirection.HORIZONTAL, size=30)])
+        save_config(Config(custom_layouts=[layout]), config_path)
+
+        assert "!!python" not in config_path.read_text(encoding="utf-8")
+        loaded, warnings = load_config(config_path=config_path)
+        assert warnings == []
+        assert loaded.custom_layouts == [layout]
+
+    def test_leaves_no_temp_files(self, tmp_path: Path) -> None:
+        """The atomic write should replace the target and clean up after itself."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("status_bar_enabled: false\n", encoding="utf-8")
+        save_config(Config(status_bar_enabled=True), config_path)
+
+        assert [p.name for p in tmp_path.iterdir()] == ["config.yaml"]
+        assert yaml.safe_load(config_path.read_text(encoding="utf-8"))["status_bar_enabled"] is True
+
+
+class TestGetPresetConfig:
+    """Tests for get_preset_config."""
+
+    def test_minimal_preset_values(self) -> None:
+        """Minimal preset should trim monitor output."""
+        config = get_preset_config(ConfigPreset.MINIMAL)
+        assert config.session_monitor.max_events == 20
+        assert config.git_monitor.fetch_enabled is False
+
+    def test_built_once_per_preset(self) -> None:
+        """Repeated calls should reuse the same preset instance."""
+        assert get_preset_config(ConfigPreset.VERBOSE) is get_preset_config(ConfigPreset.VERBOSE)
+        assert get_preset_config(ConfigPreset.VERBOSE) is not get_preset_config(ConfigPreset.DEBUG)
+
 
 class TestGitMonitorConfig:
     """Tests for GitMonitorConfig model."""
@@ -536,6 +737,15 @@ class TestConfigWarning:
         warning = ConfigWarning(file="test.yaml", field_name="x", message="error")
         assert warning.value is None
 
+    def test_immutable_without_instance_dict(self) -> None:
+        """Should be frozen and slotted."""
+        import dataclasses
+
+        warning = ConfigWarning(file="test.yaml", field_name="x", message="error")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            warning.message = "changed"  # type: ignore[misc]
+        assert not hasattr(warning, "__dict__")
+
 
 class TestDisplayConfigWarnings:
     """Tests for display_config_warnings function."""
@@ -700,3 +910,31 @@ class TestValidateLayoutName:
         for lt in LayoutType:
             with pytest.raises(ValueError, match="conflicts with built-in"):
                 validate_layout_name(lt.value)
+
+
+class TestLazyImports:
+    """Tests for deferring yaml and rich until they are needed."""
+
+    def test_import_skips_yaml_and_rich(self) -> None:
+        """Importing the module alone should not load yaml or rich."""
+        import os
+        import subprocess
+        import sys
+
+        import cctmux
+
+        src_dir = str(Path(cctmux.__file__).parents[1])
+        code = "import sys, cctmux.config; print(sorted({'yaml', 'rich'} & sys.modules.keys()))"
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONPATH": src_dir},
+        )
+        assert result.stdout.strip() == "[]"
+
+    def test_yaml_helpers_return_safe_classes(self) -> None:
+        """The loader and dumper should be the libyaml or pure-Python safe variants."""
+        assert yaml_loader() in (yaml.CSafeLoader, yaml.SafeLoader)
+        assert yaml_dumper() in (yaml.CSafeDumper, yaml.SafeDumper)
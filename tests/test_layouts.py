@@ -4,6 +4,7 @@ import pytest
 
 from cctmux.config import CustomLayout, LayoutType, PaneSplit, SplitDirection
 from cctmux.layouts import (
+    BUILTIN_LAYOUT_ROWS,
     BUILTIN_TEMPLATES,
     LAYOUT_DESCRIPTIONS,
     _validate_pane_id,
@@ -19,6 +20,7 @@ from cctmux.layouts import (
     apply_ralph_full_layout,
     apply_ralph_layout,
     apply_triple_layout,
+    dumped_template,
 )
 
 
@@ -454,6 +456,14 @@ class TestBuiltinTemplates:
         assert splits[0].command == "cctmux-session"
         assert splits[1].command == "cctmux-tasks -g"
 
+    def test_dumped_template_matches_model_dump(self) -> None:
+        """Dumped templates should equal a fresh exclude_defaults dump and be cached."""
+        dumped = dumped_template(LayoutType.TRIPLE)
+        expected = [s.model_dump(mode="json", exclude_defaults=True) for s in BUILTIN_TEMPLATES[LayoutType.TRIPLE]]
+        assert list(dumped) == expected
+        assert dumped_template(LayoutType.TRIPLE) is dumped
+        assert dumped_template(LayoutType.DEFAULT) == ()
+
 
 class TestLayoutDescriptions:
     """Tests for LAYOUT_DESCRIPTIONS dict."""
@@ -463,3 +473,7 @@ class TestLayoutDescriptions:
         for lt in LayoutType:
             assert lt in LAYOUT_DESCRIPTIONS, f"Missing description for {lt.value}"
             assert LAYOUT_DESCRIPTIONS[lt], f"Empty description for {lt.value}"
+
+    def test_builtin_rows_follow_layout_order(self) -> None:
+        """BUILTIN_LAYOUT_ROWS should pair each layout value with its description."""
+        assert tuple((lt.value, LAYOUT_DESCRIPTIONS[lt]) for lt in LayoutType) == BUILTIN_LAYOUT_ROWS
@@ -0,0 +1,251 @@
+"""Tests for the cctmux CLI module."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import typer
+from typer.testing import CliRunner
+
+import cctmux
+import cctmux.__main__ as cli
+from cctmux.__main__ import _has_content, app, git_app
+
+
+class TestImportCost:
+    """Tests that importing the CLI stays cheap."""
+
+    def test_import_skips_heavy_dependencies(self) -> None:
+        """Importing cctmux.__main__ should not load pydantic, PyYAML or rich."""
+        code = (
+            "import sys, cctmux.__main__; "
+            "print(' '.join(m for m in ('pydantic', 'yaml', 'rich', 'cctmux.config') if m in sys.modules))"
+        )
+        env = {**os.environ, "PYTHONPATH": str(Path(cctmux.__file__).parent.parent)}
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+        assert result.stdout.strip() == ""
+
+    def test_apps_skip_rich_markup(self) -> None:
+        """Every Typer app should disable Rich markup so help avoids the markdown parser."""
+        apps = {name: value for name, value in vars(cli).items() if isinstance(value, typer.Typer)}
+        assert "app" in apps
+        for name, typer_app in apps.items():
+            assert typer_app.rich_markup_mode is None, name
+
+
+class TestHasContent:
+    """Tests for _has_content."""
+
+    def test_comments_and_blank_lines_only(self) -> None:
+        """Comment-only text, including indented comments, has no content."""
+        assert not _has_content("# heading\n\n   \n  # indented comment\n")
+        assert not _has_content("")
+
+    def test_detects_first_real_line(self) -> None:
+        """Any non-comment, non-blank line counts as content."""
+        assert _has_content("# heading\n\nname: side\n")
+        assert _has_content("  splits: []")
+
+
+class TestLayoutEditor:
+    """Tests for the $EDITOR round trip in layout add."""
+
+    def test_editor_with_arguments(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """An EDITOR value with quoted arguments should run without a shell."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+        monkeypatch.setenv("EDITOR", "sed -i 's/My custom layout/Edited by sed/'")
+
+        result = CliRunner().invoke(app, ["layout", "add", "side-pane"])
+
+        assert result.exit_code == 0, result.output
+        saved = (tmp_path / "config" / "cctmux" / "config.yaml").read_text(encoding="utf-8")
+        assert "Edited by sed" in saved
+
+    def test_missing_editor(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A missing editor binary should fail without saving the layout."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+        monkeypatch.setenv("EDITOR", "cctmux-no-such-editor")
+
+        result = CliRunner().invoke(app, ["layout", "add", "side-pane"])
+
+        assert result.exit_code == 1
+        assert not (tmp_path / "config" / "cctmux" / "config.yaml").exists()
+
+    def test_emptied_file_cancels(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Leaving only comments and blank lines should cancel without saving."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+        monkeypatch.setenv("EDITOR", "sed -i '/^[^#]/d'")
+
+        result = CliRunner().invoke(app, ["layout", "add", "side-pane"])
+
+        assert result.exit_code == 0, result.output
+        assert "Cancelled" in result.output
+        assert not (tmp_path / "config" / "cctmux" / "config.yaml").exists()
+
+    def test_edit_replaces_layout(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Editing should update the named layout in place."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+        monkeypatch.setenv("EDITOR", "true")
+        assert CliRunner().invoke(app, ["layout", "add", "side-pane"]).exit_code == 0
+
+        monkeypatch.setenv("EDITOR", "sed -i 's/^description: .*/description: Renamed/'")
+        result = CliRunner().invoke(app, ["layout", "edit", "side-pane"])
+
+        assert result.exit_code == 0, result.output
+        saved = (tmp_path / "config" / "cctmux" / "config.yaml").read_text(encoding="utf-8")
+        assert "description: Renamed" in saved
+
+    def test_add_rejects_rename_to_existing_layout(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Renaming a new layout in the editor must not duplicate an existing name."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+        monkeypatch.setenv("EDITOR", "true")
+        assert CliRunner().invoke(app, ["layout", "add", "side-pane"]).exit_code == 0
+
+        monkeypatch.setenv("EDITOR", "sed -i 's/^name: .*/name: side-pane/'")
+        result = CliRunner().invoke(app, ["layout", "add", "other-pane"])
+
+        assert result.exit_code == 1
+        assert "already exists" in result.output
+        saved = (tmp_path / "config" / "cctmux" / "config.yaml").read_text(encoding="utf-8")
+        assert saved.count("name: side-pane") == 1
+
+    def test_edit_rejects_rename_to_existing_layout(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Renaming a layout in the editor must not duplicate another layout's name."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+        monkeypatch.setenv("EDITOR", "true")
+        assert CliRunner().invoke(app, ["layout", "add", "side-pane"]).exit_code == 0
+        assert CliRunner().invoke(app, ["layout", "add", "other-pane"]).exit_code == 0
+
+        monkeypatch.setenv("EDITOR", "sed -i 's/^name: .*/name: side-pane/'")
+        result = CliRunner().invoke(app, ["layout", "edit", "other-pane"])
+
+        assert result.exit_code == 1
+        assert "already exists" in result.output
+        saved = (tmp_path / "config" / "cctmux" / "config.yaml").read_text(encoding="utf-8")
+        assert saved.count("name: side-pane") == 1
+        assert "name: other-pane" in saved
+
+
+class TestLayoutLookup:
+    """Tests for commands that look up custom layouts by name."""
+
+    @pytest.mark.parametrize("command", ["show", "edit", "remove"])
+    def test_missing_layout_errors(self, command: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Unknown custom layout names should exit with an error."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+
+        result = CliRunner().invoke(app, ["layout", command, "no-such-layout"])
+
+        assert result.exit_code == 1
+        assert "not found" in result.output
+
+    def test_finds_layout_appended_to_same_config(self) -> None:
+        """A layout appended after an earlier lookup should be found on the same Config."""
+        from cctmux.config import Config, CustomLayout
+
+        config = Config(custom_layouts=[CustomLayout(name="side")])
+        assert cli._require_custom_layout(config, "side").name == "side"
+        extra = CustomLayout(name="extra")
+        config.custom_layouts.append(extra)
+        assert cli._require_custom_layout(config, "extra") is extra
+
+    def test_remove_existing_layout(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Removing a saved layout should drop it from the config file."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+        monkeypatch.setenv("EDITOR", "true")
+        assert CliRunner().invoke(app, ["layout", "add", "side-pane"]).exit_code == 0
+
+        result = CliRunner().invoke(app, ["layout", "remove", "side-pane"])
+
+        assert result.exit_code == 0, result.output
+        saved = (tmp_path / "config" / "cctmux" / "config.yaml").read_text(encoding="utf-8")
+        assert "side-pane" not in saved
+
+
+class TestGitPresetOverrides:
+    """Tests for CLI options overriding cctmux-git presets."""
+
+    def test_explicit_default_value_overrides_preset(self) -> None:
+        """-m 10 equals the option default but must still beat the preset's 5."""
+        with patch("cctmux.git_monitor.run_git_monitor") as run:
+            result = CliRunner().invoke(git_app, ["--preset", "minimal", "-m", "10"])
+
+        assert result.exit_code == 0, result.output
+        assert run.call_args.kwargs["max_commits"] == 10
+        assert run.call_args.kwargs["max_files"] == 15
+
+    def test_preset_applies_without_flags(self) -> None:
+        """Omitted options should keep the preset's values."""
+        with patch("cctmux.git_monitor.run_git_monitor") as run:
+            result = CliRunner().invoke(git_app, ["--preset", "minimal"])
+
+        assert result.exit_code == 0, result.output
+        assert run.call_args.kwargs["max_commits"] == 5
+
+    def test_overrides_leave_shared_preset_untouched(self) -> None:
+        """CLI overrides must not leak into the cached preset instance."""
+        from cctmux.config import ConfigPreset, get_preset_config
+
+        with patch("cctmux.git_monitor.run_git_monitor"):
+            result = CliRunner().invoke(git_app, ["--preset", "minimal", "-m", "10", "--fetch"])
+
+        assert result.exit_code == 0, result.output
+        git_config = get_preset_config(ConfigPreset.MINIMAL).git_monitor
+        assert git_config.max_commits == 5
+        assert git_config.fetch_enabled is False
+
+
+class TestRalphStatusColors:
+    """Tests for the ralph status color map."""
+
+    def test_covers_every_status(self) -> None:
+        """Every RalphStatus should have a color and no stale keys should remain."""
+        from cctmux.ralph_runner import RalphStatus
+
+        assert set(cli._ralph_status_colors()) == set(RalphStatus)
+
+    def test_plain_status_strings_match(self) -> None:
+        """Status strings loaded from the state file should find their color."""
+        assert cli._ralph_status_colors().get("completed") == "green"
+
+
+class TestSyncSkill:
+    """Tests for the startup skill sync."""
+
+    def test_returns_notices_without_printing(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """The sync should leave printing to the main thread."""
+        with patch("cctmux.__main__.Path.home", return_value=tmp_path):
+            notices = cli._sync_skill()
+            assert notices
+            assert all("skill updated" in notice for notice in notices)
+            assert cli._sync_skill() == []
+        assert capsys.readouterr().out == ""
+
+    def test_installed_files_keep_source_mode(self, tmp_path: Path) -> None:
+        """Installed skill files should carry the bundled file's permission bits."""
+        import stat
+
+        with patch("cctmux.__main__.Path.home", return_value=tmp_path):
+            cli._sync_skill()
+        installed = next((tmp_path / ".claude" / "skills").rglob("SKILL.md"))
+        bundled = cli._SKILL_BASE / installed.parent.name / "SKILL.md"
+        assert stat.S_IMODE(installed.stat().st_mode) == stat.S_IMODE(bundled.stat().st_mode)
+
+    def test_copies_leave_no_temp_files(self, tmp_path: Path) -> None:
+        """Atomic copies should not leave temp files beside the installed skill."""
+        with patch("cctmux.__main__.Path.home", return_value=tmp_path):
+            cli._sync_skill()
+        skills_dir = tmp_path / ".claude" / "skills"
+        assert any(skills_dir.rglob("SKILL.md"))
+        assert not list(skills_dir.rglob("*.tmp"))
@@ -1,5 +1,6 @@
 """Tests for pitmux functionality."""
 
+import os
 from pathlib import Path
 from unittest.mock import patch
 
@@ -36,6 +37,19 @@ class TestSyncPiSkill:
             mtime_second = dest.stat().st_mtime_ns
         assert mtime_first == mtime_second, "Sync should not touch file when hashes match"
 
+    def test_realigns_mtime_when_content_matches(self, tmp_path: Path) -> None:
+        """Same content with a different mtime should not be recopied, only realigned."""
+        fake_home = tmp_path / "home"
+        with patch("cctmux.__main__.Path.home", return_value=fake_home):
+            _sync_pi_skill()
+            dest = fake_home / ".pi" / "agent" / "skills" / "pi-tmux" / "SKILL.md"
+            src_mtime = dest.stat().st_mtime_ns
+            os.utime(dest, ns=(src_mtime, src_mtime - 1_000_000_000))
+            with patch("shutil.copyfile") as mock_copy:
+                _sync_pi_skill()
+            mock_copy.assert_not_called()
+        assert dest.stat().st_mtime_ns == src_mtime
+
     def test_rewrites_on_content_change(self, tmp_path: Path) -> None:
         """Should rewrite the destination when source hash differs."""
         fake_home = tmp_path / "home"
@@ -112,6 +126,17 @@ class TestPitmuxCLI:
         assert result.exit_code == 0, result.output
         assert "pi --model x" in result.output
 
+    def test_dry_run_resume_flag_matches_whole_tokens(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """-r should still append --resume when pi-args only has a look-alike flag."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.delenv("TMUX", raising=False)
+
+        runner = CliRunner()
+        result = runner.invoke(pi_app, ["--dry-run", "-r", "-c", "--pi-args", "--continue --resume-x"])
+        assert result.exit_code == 0, result.output
+        assert "pi --continue --resume-x --resume Enter" in " ".join(result.output.split())
+
     def test_refuses_when_inside_tmux(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
         """Should exit non-zero if $TMUX is set."""
         monkeypatch.chdir(tmp_path)
@@ -473,6 +473,14 @@ class TestRalphState:
         result = load_ralph_state(tmp_path)
         assert result is None
 
+    def test_load_non_utf8_file(self, tmp_path: Path) -> None:
+        """Test that undecodable bytes are treated like a corrupted file."""
+        state_dir = tmp_path / ".claude"
+        state_dir.mkdir(parents=True)
+        (state_dir / "ralph-state.json").write_bytes(b'{"status": "\xff"}')
+
+        assert load_ralph_state(tmp_path) is None
+
     def test_atomic_write(self, tmp_path: Path) -> None:
         """Test that save creates .claude directory if missing."""
         state = RalphState(status="active", started_at="2025-01-15T14:30:00Z")
@@ -490,6 +498,25 @@ class TestRalphState:
         assert state.max_budget_usd is None
         assert state.ended_at is None
         assert state.iterations == []
+        assert state.total_cost_usd == 0.0
+
+    def test_total_cost_backfilled_from_legacy_state(self) -> None:
+        """State files without a stored total should sum per-iteration costs."""
+        legacy = '{"iterations": [{"cost_usd": 0.25}, {"cost_usd": 0.5}, {"number": 3}]}'
+        state = RalphState.model_validate_json(legacy)
+        assert state.total_cost_usd == 0.75
+
+    def test_stored_total_cost_is_trusted(self) -> None:
+        """A persisted total should be used as-is rather than recomputed."""
+        state = RalphState.model_validate_json('{"iterations": [{"cost_usd": 0.25}], "total_cost_usd": 2.0}')
+        assert state.total_cost_usd == 2.0
+
+    def test_record_iteration_updates_total(self) -> None:
+        """Recording an iteration should append it and add its cost."""
+        state = RalphState(iterations=[{"cost_usd": 0.5}])
+        state.record_iteration({"number": 2, "cost_usd": 0.25})
+        assert len(state.iterations) == 2
+        assert state.total_cost_usd == 0.75
 
 
 class TestCancelRalphLoop:
@@ -961,5 +988,6 @@ class TestRunRalphLoop:
         assert state is not None
         total_cost = sum(it.get("cost_usd", 0.0) for it in state.iterations)
         assert total_cost == 1.50
+        assert state.total_cost_usd == 1.50
         total_in = sum(it.get("input_tokens", 0) for it in state.iterations)
         assert total_in == 10000
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import os
 from datetime import datetime
 from pathlib import Path
 
@@ -21,6 +22,7 @@ from cctmux.session_monitor import (
     calculate_event_window,
     calculate_stats,
     estimate_cost,
+    list_sessions,
     load_events_from_file,
     parse_jsonl_line,
     resolve_session_path,
@@ -518,6 +520,31 @@ class TestResolveSessionPath:
         assert "new-session" in name or "two" in name
 
 
+class TestListSessions:
+    """Tests for list_sessions function."""
+
+    def test_lists_most_recent_first_capped_at_15(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Should print only the 15 newest session files, newest first."""
+        projects = tmp_path / ".claude" / "projects" / "-home-user-demo"
+        projects.mkdir(parents=True)
+        for i in range(20):
+            jsonl_file = projects / f"session{i:02d}-0000.jsonl"
+            jsonl_file.write_text("{}", encoding="utf-8")
+            os.utime(jsonl_file, (1_700_000_000 + i, 1_700_000_000 + i))
+        (projects / "notes.txt").write_text("ignored", encoding="utf-8")
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+
+        list_sessions()
+
+        output = capsys.readouterr().out
+        assert output.count("(demo)") == 15
+        assert output.index("session19") < output.index("session05")
+        assert "session04" not in output
+        assert "notes" not in output
+
+
 class TestEventWindow:
     """Tests for EventWindow and calculate_event_window."""
 
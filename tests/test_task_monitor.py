@@ -13,6 +13,7 @@ from cctmux.task_monitor import (
     SessionInfo,
     Task,
     TaskWindow,
+    _count_task_files,
     _format_acceptance_criteria,
     _format_work_log,
     build_dependency_graph,
@@ -272,6 +273,20 @@ class TestEncodeProjectPath:
         assert result.startswith("-")
 
 
+class TestCountTaskFiles:
+    """Tests for _count_task_files function."""
+
+    def test_counts_json_files_like_glob(self, tmp_path: Path) -> None:
+        """Test that every *.json name is counted, dotfiles included, as Path.glob did."""
+        for name in ("1.json", "2.json", ".hidden.json", "notes.txt"):
+            (tmp_path / name).write_text("{}", encoding="utf-8")
+        assert _count_task_files(tmp_path) == len(list(tmp_path.glob("*.json"))) == 3
+
+    def test_missing_folder(self, tmp_path: Path) -> None:
+        """Test that an unreadable folder counts as empty."""
+        assert _count_task_files(tmp_path / "missing") == 0
+
+
 class TestSessionInfo:
     """Tests for SessionInfo dataclass."""
 